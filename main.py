@@ -3,8 +3,11 @@
 Daily Tech News Bot
 毎日技術ニュースを収集し、Claude AIで分析してGitHub Issueに通知する
 """
+import argparse
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 from src.fetchers import (
@@ -16,12 +19,109 @@ from src.fetchers import (
     PublickeyFetcher
 )
 from src.ai_analyzer import AIAnalyzer
+from src.content_extractor import ContentExtractor
+from src.archive import NewsArchive
 from src.history_manager import HistoryManager
-from src.github_notifier import GitHubNotifier
+from src.profiles import Profile, load_profiles
+from src.summary_cache import SummaryCache
+from src.source_health import SourceHealthTracker
+from src.run_snapshot import (
+    RunSnapshot,
+    RecordingClient,
+    REPLAYABLE_STAGES,
+    news_to_dict,
+    analysis_to_dict,
+    replay
+)
+from src.notifiers import (
+    Digest,
+    GitHubNotifier,
+    WebhookNotifier,
+    StaticFileNotifier,
+    deliver_all
+)
+
+
+def build_notifiers(names, settings=os.environ, data_dir="data"):
+    """
+    設定から通知先を生成
+    names: 通知先名のリスト（"github", "webhook", "static"）
+    settings: 設定の参照先（環境変数、またはプロファイルの設定）
+    data_dir: outboxなどの保存先
+    設定が不足している場合はエラーメッセージを表示して終了する
+    """
+    notifiers = []
+    for name in names:
+        if name == "github":
+            github_token = settings.get("GITHUB_TOKEN")
+            github_repo = settings.get("GITHUB_REPOSITORY")  # 形式: "owner/repo"
+            notify_mode = settings.get("GITHUB_NOTIFY_MODE", GitHubNotifier.MODE_ISSUE)  # "issue" or "append"
+
+            if not github_token:
+                print("Error: GITHUB_TOKEN is not set")
+                sys.exit(1)
+
+            if not github_repo or "/" not in github_repo:
+                print("Error: GITHUB_REPOSITORY is not set or invalid format (expected: owner/repo)")
+                sys.exit(1)
+
+            if notify_mode not in (GitHubNotifier.MODE_ISSUE, GitHubNotifier.MODE_APPEND):
+                print("Error: GITHUB_NOTIFY_MODE must be 'issue' or 'append'")
+                sys.exit(1)
+
+            repo_owner, repo_name = github_repo.split("/", 1)
+            notifiers.append(GitHubNotifier(
+                github_token, repo_owner, repo_name, mode=notify_mode,
+                cache_file=os.path.join(data_dir, "issue_cache.json"),
+                outbox_dir=os.path.join(data_dir, "outbox", "github"),
+                api_base=settings.get("GITHUB_API_URL", "https://api.github.com")
+            ))
+        elif name == "webhook":
+            webhook_url = settings.get("WEBHOOK_URL")
+            if not webhook_url:
+                print("Error: WEBHOOK_URL is not set")
+                sys.exit(1)
+            notifiers.append(WebhookNotifier(
+                webhook_url, format=settings.get("WEBHOOK_FORMAT", WebhookNotifier.FORMAT_SLACK)
+            ))
+        elif name == "static":
+            formats = [f.strip() for f in settings.get("STATIC_FORMATS", "md,html,rss").split(",") if f.strip()]
+            notifiers.append(StaticFileNotifier(
+                output_dir=settings.get("STATIC_OUTPUT_DIR", "public"),
+                formats=formats,
+                site_url=settings.get("STATIC_SITE_URL", "")
+            ))
+        else:
+            print(f"Error: Unknown notifier: {name}")
+            sys.exit(1)
+
+    return notifiers
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Daily Tech News Bot")
+    parser.add_argument("--profiles", metavar="PATH",
+                        help="複数プロファイルの設定ファイル（環境変数PROFILES_FILEでも指定可）")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="各ステージの入出力をdata/snapshots/に保存する（環境変数SNAPSHOT=1でも有効）")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="保存したスナップショットからステージをオフラインで再実行してプロファイルする")
+    parser.add_argument("--stage", choices=REPLAYABLE_STAGES + ["all"], default="all",
+                        help="--replayで再実行するステージ")
+    parser.add_argument("--profile-out", metavar="PATH",
+                        help="--replayのプロファイル結果をpstats形式で保存する")
+    return parser.parse_args()
 
 
 def main():
     """メイン処理"""
+    args = parse_args()
+
+    # スナップショットの再生はネットワーク・APIキーなしで実行できる
+    if args.replay:
+        replay(args.replay, args.stage, profile_out=args.profile_out)
+        return
+
     # 環境変数を読み込み（既存の環境変数を上書きしない）
     load_dotenv(override=False)
 
@@ -37,25 +137,47 @@ def main():
     print(f"  PWD: {os.getcwd()}")
 
     api_key = os.getenv("ANTHROPIC_API_KEY")
-    github_token = os.getenv("GITHUB_TOKEN")
-    github_repo = os.getenv("GITHUB_REPOSITORY")  # 形式: "owner/repo"
+    # 記事本文の抽出（"1"で有効）
+    extract_content = os.getenv("EXTRACT_CONTENT") == "1"
+
+    # ニュースアーカイブ（空文字で無効）
+    archive_db = os.getenv("ARCHIVE_DB", "data/archive.sqlite3")
+
+    # 実行スナップショットの保存
+    snapshot = RunSnapshot() if args.snapshot or os.getenv("SNAPSHOT") == "1" else None
+
+    # "1"でサーキットブレーカー・取得間隔を無視して全ソースを取得
+    force_poll_all = os.getenv("FORCE_POLL_ALL") == "1"
+
+    # 複数プロファイルの設定ファイル
+    profiles_file = args.profiles or os.getenv("PROFILES_FILE")
 
     if not api_key:
         print("Error: ANTHROPIC_API_KEY is not set")
         sys.exit(1)
 
-    if not github_token:
-        print("Error: GITHUB_TOKEN is not set")
-        sys.exit(1)
-
-    if not github_repo or "/" not in github_repo:
-        print("Error: GITHUB_REPOSITORY is not set or invalid format (expected: owner/repo)")
-        sys.exit(1)
+    if profiles_file:
+        try:
+            profiles = load_profiles(profiles_file)
+        except (OSError, ValueError) as e:
+            print(f"Error: Failed to load profiles from {profiles_file}: {e}")
+            sys.exit(1)
+    else:
+        # 単一プロファイル: これまで通り環境変数の設定とdata/直下のファイルを使う
+        # 通知先（カンマ区切り）: github, webhook, static
+        notifier_names = [n.strip() for n in os.getenv("NOTIFIERS", "github").split(",") if n.strip()]
+        profiles = [Profile("default", notifiers=notifier_names, data_dir="data",
+                            static_dir=os.getenv("STATIC_OUTPUT_DIR", "public"))]
 
-    repo_owner, repo_name = github_repo.split("/", 1)
+    notifiers = {
+        profile.name: build_notifiers(profile.notifiers, profile.notifier_settings(), profile.data_dir)
+        for profile in profiles
+    }
 
     print("=" * 60)
     print("Daily Tech News Bot - Starting")
+    if profiles_file:
+        print(f"Profiles: {', '.join(p.name for p in profiles)}")
     print("=" * 60)
 
     # 各コンポーネントを初期化
@@ -68,73 +190,257 @@ def main():
         PublickeyFetcher()
     ]
 
-    analyzer = AIAnalyzer(api_key)
-    history = HistoryManager()
-    notifier = GitHubNotifier(github_token, repo_owner, repo_name)
+    summary_cache = SummaryCache()
+    analyzer = AIAnalyzer(api_key, summary_cache=summary_cache)
+    if snapshot:
+        analyzer.client = RecordingClient(analyzer.client, snapshot)
+    histories = {profile.name: HistoryManager(profile.history_file) for profile in profiles}
+    health = SourceHealthTracker()
+    extractor = None
+    if extract_content:
+        extractor = ContentExtractor(
+            max_workers=int(os.getenv("CONTENT_MAX_WORKERS", "4")),
+            token_budget=int(os.getenv("CONTENT_TOKEN_BUDGET", "1500"))
+        )
+
+    archive = None
+    if archive_db:
+        # アーカイブは補助的な記録のため、開けなくてもニュースの配信は続ける
+        try:
+            archive = NewsArchive(archive_db)
+        except Exception as e:
+            print(f"Error opening news archive {archive_db}: {e}")
 
     # 古い履歴をクリーンアップ（30日より古いものを削除）
-    history.cleanup_old_entries(days=30)
+    for history in histories.values():
+        history.cleanup_old_entries(days=30)
+    summary_cache.cleanup_old_entries(days=30)
+    if extractor:
+        extractor.cleanup_old_entries(days=30)
 
-    # Step 1: 全サイトからニュースを収集
+    # 前回の実行で送信できなかったダイジェストを再送
+    for profile_notifiers in notifiers.values():
+        for notifier in profile_notifiers:
+            notifier.flush_outbox()
+
+    # Step 1: 全サイトからニュースを収集（全プロファイルで共有）
     print("\n[Step 1] Fetching news from all sources...")
     all_news = []
+    polled = {}  # ソース名 -> (レイテンシ, 取得件数)
+    fetched_urls = {}  # ソース名 -> 取得した記事のURL
     for fetcher in fetchers:
-        print(f"  - Fetching from {fetcher.source_name}...", end=" ")
+        source = fetcher.source_name
+        if not any(profile.accepts(source) for profile in profiles):
+            continue
+
+        should_poll, reason = health.should_poll(source)
+        if not should_poll and not force_poll_all:
+            print(f"  - Skipping {source}: {reason}")
+            continue
+
+        print(f"  - Fetching from {source}...", end=" ")
+        started = time.monotonic()
         try:
             news = fetcher.fetch()
-            all_news.extend(news)
-            print(f"✓ ({len(news)} items)")
+            error = fetcher.last_error
         except Exception as e:
-            print(f"✗ Error: {e}")
+            news = []
+            error = e
+        latency = time.monotonic() - started
+
+        if error is not None:
+            print(f"✗ Error: {error} ({latency:.1f}s)")
+            health.record_failure(source, latency, error)
+        else:
+            all_news.extend(news)
+            polled[source] = (latency, len(news))
+            fetched_urls[source] = [item.url for item in news]
+            print(f"✓ ({len(news)} items, {latency:.1f}s)")
+
+    # 複数のソースに同じ記事が載っている場合は最初のものだけ残す
+    seen_urls = set()
+    unique_news = []
+    for item in all_news:
+        if item.url not in seen_urls:
+            seen_urls.add(item.url)
+            unique_news.append(item)
+    all_news = unique_news
 
     print(f"\nTotal fetched: {len(all_news)} news items")
 
-    # Step 2: 既に通知済みのニュースを除外
+    if archive:
+        try:
+            archive.add_fetched(all_news)
+        except Exception as e:
+            print(f"Error archiving fetched news: {e}")
+
+    if snapshot:
+        snapshot.record("fetch", news=[news_to_dict(item) for item in all_news], sources=polled)
+
+    # Step 2: プロファイルごとに既に通知済みのニュースを除外
     print("\n[Step 2] Filtering out already notified news...")
-    new_news = history.filter_new_news(all_news)
-    print(f"New news items: {len(new_news)} (filtered out {len(all_news) - len(new_news)} duplicates)")
+    new_news_by_profile = {}
+    filter_snapshot = {}
+    for profile in profiles:
+        history = histories[profile.name]
+        candidates = [item for item in all_news if profile.accepts(item.source)]
+        new_news = history.filter_new_news(candidates)
+        new_news_by_profile[profile.name] = new_news
+        label = f"[{profile.name}] " if profiles_file else ""
+        print(f"{label}New news items: {len(new_news)} (filtered out {len(candidates) - len(new_news)} duplicates)")
+
+        filter_snapshot[profile.name] = {
+            "sources": sorted(profile.sources) if profile.sources else None,
+            "notified_urls": dict(history.history["notified_urls"]),
+            "new_urls": [item.url for item in new_news],
+        }
+
+    if snapshot:
+        snapshot.record("filter", profiles=filter_snapshot)
+
+    # ソースの状態を記録（新着はそのソースで初めて見たURL。次回以降の取得間隔の判断に使う）
+    for source, (latency, _) in polled.items():
+        health.record_success(source, latency, fetched_urls[source])
+    health.save()
+    print("\nSource health:")
+    health.print_summary()
 
-    if not new_news:
-        print("\n[Result] No new news to report today.")
-        notifier.send_daily_digest([])
+    # ニュースがないプロファイルには「新着なし」を通知
+    for profile in profiles:
+        if not new_news_by_profile[profile.name]:
+            label = f" ({profile.name})" if profiles_file else ""
+            print(f"\n[Result] No new news to report today{label}.")
+            deliver_all(Digest([]), notifiers[profile.name])
+
+    active_profiles = [profile for profile in profiles if new_news_by_profile[profile.name]]
+    if not active_profiles:
+        if snapshot:
+            snapshot.save()
+        if archive:
+            archive.close()
         return
 
-    # Step 3: Claude AIで話題性の高いニュースを選定（最大5件）
+    # Step 3: プロファイルごとにClaude AIで話題性の高いニュースを選定（並列）
     print("\n[Step 3] Ranking news with Claude AI...")
-    top_news = analyzer.rank_news(new_news, top_n=5)
-    print(f"Selected top {len(top_news)} news items")
+    if archive:
+        try:
+            for profile in active_profiles:
+                archive.add_fetched(new_news_by_profile[profile.name], candidate=True, profile=profile.name)
+        except Exception as e:
+            print(f"Error archiving ranking candidates: {e}")
+
+    if snapshot:
+        snapshot.current_stage = "rank"
+
+    def rank(profile):
+        return analyzer.rank_news(new_news_by_profile[profile.name], top_n=profile.top_n,
+                                  criteria=profile.criteria)
+
+    with ThreadPoolExecutor(max_workers=len(active_profiles), thread_name_prefix="ranker") as executor:
+        top_news_by_profile = dict(zip(
+            (profile.name for profile in active_profiles),
+            executor.map(rank, active_profiles)
+        ))
+
+    for profile in active_profiles:
+        top_news = top_news_by_profile[profile.name]
+        label = f"[{profile.name}] " if profiles_file else ""
+        print(f"{label}Selected top {len(top_news)} news items")
+
+    if snapshot:
+        snapshot.record("rank", profiles={
+            profile.name: {
+                "candidates": [news_to_dict(item) for item in new_news_by_profile[profile.name]],
+                "top_n": profile.top_n,
+                "criteria": profile.criteria,
+                "selected_urls": [item.url for item in top_news_by_profile[profile.name]],
+            } for profile in active_profiles
+        })
+
+    # 複数のプロファイルで選ばれた記事は1度だけ本文取得・要約する
+    selected_news = []
+    selected_urls = set()
+    for profile in active_profiles:
+        for item in top_news_by_profile[profile.name]:
+            if item.url not in selected_urls:
+                selected_urls.add(item.url)
+                selected_news.append(item)
+
+    # Step 3.5: 選定した記事の本文を並列に取得（オプション）
+    if extractor:
+        print("\n[Step 3.5] Extracting article content...")
+        extractor.extract_all(selected_news)
 
     # Step 4: 各ニュースを要約してコメントを生成
     print("\n[Step 4] Generating summaries and comments...")
-    news_with_analysis = []
+    analysis_by_url = {}
+    if snapshot:
+        snapshot.current_stage = "summarize"
+        snapshot.record("summarize",
+                        inputs=[news_to_dict(item) for item in selected_news],
+                        cached_urls=[item.url for item in selected_news
+                                     if summary_cache.get(SummaryCache.make_key(item, analyzer.model))])
 
-    for idx, news_item in enumerate(top_news, 1):
-        print(f"  [{idx}/{len(top_news)}] Analyzing: {news_item.title[:50]}...")
+    for idx, news_item in enumerate(selected_news, 1):
+        print(f"  [{idx}/{len(selected_news)}] Analyzing: {news_item.title[:50]}...")
         try:
             analysis = analyzer.summarize_and_comment(news_item)
-            news_with_analysis.append({
+            analysis_by_url[news_item.url] = {
                 'news': news_item,
                 'summary': analysis['summary'],
                 'comment': analysis['comment']
-            })
-            # 履歴に追加
-            history.add_notified(news_item.url)
+            }
         except Exception as e:
             print(f"    Error analyzing news: {e}")
             # エラーでも記事自体は送信
-            news_with_analysis.append({
+            analysis_by_url[news_item.url] = {
                 'news': news_item,
                 'summary': news_item.description[:200] if news_item.description else "詳細は記事をご覧ください。",
                 'comment': "注目のニュースです!"
-            })
-            history.add_notified(news_item.url)
+            }
+
+    if snapshot:
+        snapshot.current_stage = None
+        snapshot.record("summarize", outputs=analysis_to_dict(list(analysis_by_url.values())))
+
+    # Step 5: プロファイルごとに全ての通知先に並列で送信（GitHubは失敗してもoutboxに残り次回再送）
+    print("\n[Step 5] Delivering digest...")
+    total_sent = 0
+    render_snapshot = {}
+    for profile in active_profiles:
+        news_with_analysis = [analysis_by_url[item.url] for item in top_news_by_profile[profile.name]]
+
+        # 履歴に追加
+        history = histories[profile.name]
+        for item in news_with_analysis:
+            history.add_notified(item['news'].url)
+
+        if archive:
+            try:
+                archive.record_analysis(news_with_analysis, profile=profile.name)
+            except Exception as e:
+                print(f"Error archiving analysis: {e}")
+
+        digest = Digest(news_with_analysis)
+        render_snapshot[profile.name] = {
+            "news_with_analysis": analysis_to_dict(news_with_analysis),
+            "generated_at": digest.generated_at.isoformat(),
+            "markdown": digest.markdown,
+        }
+
+        if profiles_file:
+            print(f"  [{profile.name}]")
+        deliver_all(digest, notifiers[profile.name])
+        total_sent += len(news_with_analysis)
 
-    # Step 5: GitHub Issueを作成
-    print("\n[Step 5] Creating GitHub Issue...")
-    notifier.send_daily_digest(news_with_analysis)
+    if snapshot:
+        snapshot.record("render", profiles=render_snapshot)
+        snapshot.save()
+    if archive:
+        archive.close()
 
     print("\n" + "=" * 60)
-    print(f"Daily Tech News Bot - Completed ({len(news_with_analysis)} news sent)")
+    print(f"Daily Tech News Bot - Completed ({total_sent} news sent)")
     print("=" * 60)
 
 
@@ -1,13 +1,36 @@
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional
 from anthropic import AnthropicBedrock
 from .fetchers.base import NewsItem
+from .summary_cache import SummaryCache
 
 
 class AIAnalyzer:
     """Claude APIを使ってニュースを分析・要約するクラス"""
 
-    def __init__(self, api_key: str):
+    # rank_newsのデフォルトの選定基準
+    DEFAULT_CRITERIA = [
+        "技術トレンドとして注目されているか",
+        "ソフトウェア開発に影響を与える内容か",
+        "業界で話題になっている可能性が高いか",
+        "新規性や革新性があるか",
+        "日本語記事を優先するが、英語でも重要な内容であれば含める",
+    ]
+
+    def __init__(self, api_key: str, client=None, summary_cache: Optional[SummaryCache] = None):
+        """
+        Args:
+            api_key: Anthropic APIキー
+            client: 使用するクライアント（スナップショットの再生などで外部から渡す場合）
+            summary_cache: 要約・コメントのキャッシュ（同じ記事を再度要約しない）
+        """
+        self.summary_cache = summary_cache
+
+        if client is not None:
+            self.client = client
+            self.model = os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022")
+            return
+
         # 環境変数でBedrockプロキシが指定されている場合はそちらを使う
         use_bedrock = os.getenv("CLAUDE_CODE_USE_BEDROCK") == "1"
         bedrock_base_url = os.getenv("ANTHROPIC_BEDROCK_BASE_URL")
@@ -45,25 +68,24 @@ class AIAnalyzer:
             self.client = Anthropic(api_key=api_key)
             self.model = "claude-3-5-sonnet-20241022"
 
-    def rank_news(self, news_items: List[NewsItem], top_n: int = 5) -> List[NewsItem]:
+    def rank_news(self, news_items: List[NewsItem], top_n: int = 5,
+                  criteria: Optional[List[str]] = None) -> List[NewsItem]:
         """
         全ニュースをClaude AIに評価させて、話題性の高い上位N件を選定
+        criteria: 選定基準（省略時はDEFAULT_CRITERIA）
         """
         if not news_items:
             return []
 
         # ニュース情報を文字列化
         news_list_text = self._format_news_for_ranking(news_items)
+        criteria_text = "\n".join(f"- {c}" for c in (criteria or self.DEFAULT_CRITERIA))
 
         prompt = f"""以下は本日収集した技術ニュースのリストです。
 これらの中から、ソフトウェア開発者にとって最も話題性が高く、重要と思われるニュース記事を{top_n}件選んでください。
 
 選定基準:
-- 技術トレンドとして注目されているか
-- ソフトウェア開発に影響を与える内容か
-- 業界で話題になっている可能性が高いか
-- 新規性や革新性があるか
-- 日本語記事を優先するが、英語でも重要な内容であれば含める
+{criteria_text}
 
 {news_list_text}
 
@@ -112,12 +134,26 @@ class AIAnalyzer:
         """
         ニュース記事を2-3行で要約し、ユーモアある一言コメントを生成
         """
+        cache_key = None
+        if self.summary_cache is not None:
+            cache_key = SummaryCache.make_key(news_item, self.model)
+            cached = self.summary_cache.get(cache_key)
+            if cached:
+                print("    (summary cache hit)")
+                return cached
+
+        # 記事本文を抽出済みの場合は説明文の代わりに本文を渡す
+        if news_item.content:
+            detail = f"本文:\n{news_item.content}"
+        else:
+            detail = f"説明: {news_item.description[:500]}"
+
         prompt = f"""以下のニュース記事を分析してください:
 
 タイトル: {news_item.title}
 URL: {news_item.url}
 ソース: {news_item.source}
-説明: {news_item.description[:500]}
+{detail}
 
 このニュースについて以下を生成してください:
 1. 要約: 2-3行で記事の内容を簡潔にまとめる
@@ -149,10 +185,14 @@ JSON形式で返してください:
 
             result = json.loads(response_text)
 
-            return {
+            analysis = {
                 "summary": result.get("summary", news_item.description[:200]),
                 "comment": result.get("comment", "これは注目ですね!")
             }
+            # 失敗時のフォールバックはキャッシュせず、次回に再生成する
+            if cache_key:
+                self.summary_cache.put(cache_key, analysis)
+            return analysis
 
         except Exception as e:
             import traceback
@@ -0,0 +1,372 @@
+"""
+ニュースアーカイブ
+取得した全ニュースとAIの分析結果をSQLiteに保存し、全文検索できるようにする
+
+使い方:
+    python -m src.archive search "生成AI" --source ITmedia --since 2025-11-01
+    python -m src.archive import data/history.json items.jsonl
+    python -m src.archive export-training data/ranker_training.jsonl --profile backend
+    python -m src.archive stats
+"""
+import argparse
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import List, Dict, Optional
+from .fetchers.base import NewsItem
+
+
+class NewsArchive:
+    """ニュースと分析結果を保存・検索するクラス（SQLite + FTS5）"""
+
+    # trigramトークナイザーは分かち書きなしで日本語の部分一致検索ができる（SQLite 3.34以降）
+    # 3文字未満の検索語はtrigramで扱えないためLIKEで検索する
+    MIN_FTS_TERM_LENGTH = 3
+
+    # プロファイルを使わない実行（単一プロファイル）の選定を記録するプロファイル名
+    DEFAULT_PROFILE = "default"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS news (
+            id INTEGER PRIMARY KEY,
+            url TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL DEFAULT '',
+            source TEXT NOT NULL DEFAULT '',
+            description TEXT NOT NULL DEFAULT '',
+            published_at TEXT,
+            score INTEGER NOT NULL DEFAULT 0,
+            first_seen_at TEXT NOT NULL,
+            candidate INTEGER NOT NULL DEFAULT 0,
+            selected INTEGER NOT NULL DEFAULT 0,
+            rank INTEGER,
+            summary TEXT,
+            comment TEXT,
+            notified_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_news_published_at ON news(published_at);
+        CREATE INDEX IF NOT EXISTS idx_news_source ON news(source);
+    """
+
+    # プロファイルごとの選定結果（選定基準が異なるため、学習データはプロファイルごとに分ける）
+    RANKINGS_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rankings (
+            profile TEXT NOT NULL,
+            url TEXT NOT NULL,
+            selected INTEGER NOT NULL DEFAULT 0,
+            rank INTEGER,
+            ranked_at TEXT NOT NULL,
+            PRIMARY KEY (profile, url)
+        );
+    """
+
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+            title, description, summary, comment,
+            content='news', content_rowid='id', tokenize='trigram'
+        );
+        CREATE TRIGGER IF NOT EXISTS news_ai AFTER INSERT ON news BEGIN
+            INSERT INTO news_fts(rowid, title, description, summary, comment)
+            VALUES (new.id, new.title, new.description, new.summary, new.comment);
+        END;
+        CREATE TRIGGER IF NOT EXISTS news_ad AFTER DELETE ON news BEGIN
+            INSERT INTO news_fts(news_fts, rowid, title, description, summary, comment)
+            VALUES ('delete', old.id, old.title, old.description, old.summary, old.comment);
+        END;
+        CREATE TRIGGER IF NOT EXISTS news_au AFTER UPDATE ON news BEGIN
+            INSERT INTO news_fts(news_fts, rowid, title, description, summary, comment)
+            VALUES ('delete', old.id, old.title, old.description, old.summary, old.comment);
+            INSERT INTO news_fts(rowid, title, description, summary, comment)
+            VALUES (new.id, new.title, new.description, new.summary, new.comment);
+        END;
+    """
+
+    def __init__(self, db_file: str = "data/archive.sqlite3"):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_file)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+        self._create_rankings_table()
+
+        try:
+            self.conn.executescript(self.FTS_SCHEMA)
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            # 古いSQLiteではtrigramが使えないため、LIKE検索にフォールバック
+            print(f"Full-text index unavailable ({e}); falling back to LIKE search")
+            self.fts_enabled = False
+
+    def _create_rankings_table(self):
+        """rankingsテーブルを作成（以前のアーカイブの選定結果はデフォルトのプロファイルとして移行）"""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rankings'"
+        ).fetchone()
+        self.conn.executescript(self.RANKINGS_SCHEMA)
+        if not exists:
+            with self.conn:
+                self.conn.execute("""
+                    INSERT INTO rankings (profile, url, selected, rank, ranked_at)
+                    SELECT ?, url, selected, rank, COALESCE(notified_at, first_seen_at)
+                    FROM news WHERE candidate = 1
+                """, (self.DEFAULT_PROFILE,))
+
+    def close(self):
+        self.conn.close()
+
+    def add_fetched(self, news_items: List[NewsItem], candidate: bool = False,
+                    profile: str = DEFAULT_PROFILE):
+        """
+        取得したニュースをまとめて保存（既存のURLは内容を更新）
+        candidate: AIの選定対象になったニュースかどうか（選定モデルの学習データ用）
+        profile: 選定対象にしたプロファイル（candidate=Trueの場合のみ使う）
+        """
+        with self.conn:
+            self._upsert_items(news_items, candidate)
+            if candidate:
+                now = datetime.now().isoformat()
+                self.conn.executemany("""
+                    INSERT INTO rankings (profile, url, ranked_at) VALUES (?, ?, ?)
+                    ON CONFLICT(profile, url) DO NOTHING
+                """, [(profile, item.url, now) for item in news_items])
+
+    def record_analysis(self, news_with_analysis: List[Dict], profile: str = DEFAULT_PROFILE):
+        """選定されたニュースの順位・要約・コメントを保存（順位はプロファイルごとにも記録）"""
+        now = datetime.now().isoformat()
+        rows = [(
+            rank, item.get('summary'), item.get('comment'), now, item['news'].url
+        ) for rank, item in enumerate(news_with_analysis, 1)]
+
+        with self.conn:
+            self._upsert_items([item['news'] for item in news_with_analysis], candidate=True)
+            self.conn.executemany("""
+                UPDATE news SET selected = 1, rank = ?, summary = ?, comment = ?, notified_at = ?
+                WHERE url = ?
+            """, rows)
+            self.conn.executemany("""
+                INSERT INTO rankings (profile, url, selected, rank, ranked_at) VALUES (?, ?, 1, ?, ?)
+                ON CONFLICT(profile, url) DO UPDATE SET selected = 1, rank = excluded.rank
+            """, [(profile, item['news'].url, rank, now)
+                  for rank, item in enumerate(news_with_analysis, 1)])
+
+    def _upsert_items(self, news_items: List[NewsItem], candidate: bool):
+        """ニュースを一括でINSERT/UPDATE（トランザクションは呼び出し側で管理）"""
+        now = datetime.now().isoformat()
+        rows = [(
+            item.url, item.title, item.source, item.description or '',
+            item.published_date.isoformat(), item.score, now, int(candidate)
+        ) for item in news_items]
+
+        self.conn.executemany("""
+            INSERT INTO news (url, title, source, description, published_at, score, first_seen_at, candidate)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                title = excluded.title,
+                source = excluded.source,
+                description = excluded.description,
+                published_at = excluded.published_at,
+                score = MAX(news.score, excluded.score),
+                candidate = MAX(news.candidate, excluded.candidate)
+        """, rows)
+
+    def search(self, query: str = "", source: Optional[str] = None, since: Optional[str] = None,
+               selected_only: bool = False, limit: int = 20) -> List[Dict]:
+        """
+        キーワードでニュースを検索
+        query: 空白区切りのキーワード（全てを含むものを返す）
+        since: この日付（ISO形式）以降に公開されたもの
+        """
+        where = []
+        params = []
+        order = "news.published_at DESC"
+
+        terms = query.split()
+        fts_terms = [t for t in terms if self.fts_enabled and len(t) >= self.MIN_FTS_TERM_LENGTH]
+        like_terms = [t for t in terms if t not in fts_terms]
+
+        from_clause = "news"
+        if fts_terms:
+            from_clause = "news JOIN news_fts ON news_fts.rowid = news.id"
+            where.append("news_fts MATCH ?")
+            # 各語をフレーズとしてクォートし、FTSの構文として解釈させない
+            params.append(" AND ".join('"' + t.replace('"', '""') + '"' for t in fts_terms))
+            order = "bm25(news_fts), news.published_at DESC"
+
+        for term in like_terms:
+            where.append("(news.title LIKE ? OR news.description LIKE ? "
+                         "OR news.summary LIKE ? OR news.comment LIKE ?)")
+            params.extend([f"%{term}%"] * 4)
+
+        if source:
+            where.append("news.source = ?")
+            params.append(source)
+        if since:
+            where.append("news.published_at >= ?")
+            params.append(since)
+        if selected_only:
+            where.append("news.selected = 1")
+
+        sql = f"SELECT news.* FROM {from_clause}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def import_history(self, history_file: str) -> int:
+        """
+        history.json（URL -> 通知日時）を取り込む
+        タイトルなどは残っていないため、URLと通知日時のみ保存される
+        """
+        with open(history_file, 'r', encoding='utf-8') as f:
+            notified_urls = json.load(f).get("notified_urls", {})
+
+        rows = [(url, date_str, date_str) for url, date_str in notified_urls.items()]
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO news (url, first_seen_at, notified_at, candidate, selected)
+                VALUES (?, ?, ?, 1, 1)
+                ON CONFLICT(url) DO UPDATE SET
+                    notified_at = COALESCE(news.notified_at, excluded.notified_at),
+                    candidate = 1,
+                    selected = 1
+            """, rows)
+            self.conn.executemany("""
+                INSERT INTO rankings (profile, url, selected, ranked_at) VALUES (?, ?, 1, ?)
+                ON CONFLICT(profile, url) DO UPDATE SET selected = 1
+            """, [(self.DEFAULT_PROFILE, url, date_str) for url, date_str, _ in rows])
+        return len(rows)
+
+    def import_jsonl(self, jsonl_file: str) -> int:
+        """
+        NewsItem.to_dict() 形式のJSONLを取り込む
+        summary / comment を含む行は選定済みのニュースとして保存する
+        """
+        fetched = []
+        analyzed = []
+        with open(jsonl_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                item = NewsItem.from_dict(data)
+                if data.get("summary"):
+                    analyzed.append({'news': item, 'summary': data["summary"], 'comment': data.get("comment")})
+                else:
+                    fetched.append(item)
+
+        self.add_fetched(fetched)
+        if analyzed:
+            self.record_analysis(analyzed)
+        return len(fetched) + len(analyzed)
+
+    def export_training_data(self, output_file: str, profile: Optional[str] = None) -> int:
+        """
+        選定モデルの学習データをJSONLで書き出す
+        AIの選定対象になったニュースと、そのプロファイルで実際に選ばれたかどうか（label）
+        profile: 指定したプロファイルのみ（省略時は全プロファイル。各行のprofileで区別できる）
+        """
+        sql = """
+            SELECT rankings.profile, news.title, news.source, news.description, news.score,
+                   news.published_at, rankings.selected
+            FROM rankings JOIN news ON news.url = rankings.url
+            WHERE news.title != ''
+        """
+        params = []
+        if profile:
+            sql += " AND rankings.profile = ?"
+            params.append(profile)
+        sql += " ORDER BY rankings.ranked_at"
+        rows = self.conn.execute(sql, params).fetchall()
+
+        with open(output_file, 'w', encoding='utf-8') as f:
+            for row in rows:
+                record = dict(row)
+                record["label"] = record.pop("selected")
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return len(rows)
+
+    def stats(self) -> Dict:
+        """アーカイブの件数を返す"""
+        row = self.conn.execute("""
+            SELECT COUNT(*) AS total, SUM(candidate) AS candidates, SUM(selected) AS selected,
+                   MIN(published_at) AS oldest, MAX(published_at) AS newest
+            FROM news
+        """).fetchone()
+        by_source = self.conn.execute("""
+            SELECT source, COUNT(*) AS count FROM news WHERE source != ''
+            GROUP BY source ORDER BY count DESC
+        """).fetchall()
+        by_profile = self.conn.execute("""
+            SELECT profile, COUNT(*) AS candidates, SUM(selected) AS selected
+            FROM rankings GROUP BY profile ORDER BY profile
+        """).fetchall()
+        return dict(row, by_source={r["source"]: r["count"] for r in by_source},
+                    by_profile={r["profile"]: {"candidates": r["candidates"], "selected": r["selected"]}
+                                for r in by_profile})
+
+
+def _print_results(results: List[Dict]):
+    for row in results:
+        published = (row["published_at"] or "")[:16].replace("T", " ")
+        mark = "★" if row["selected"] else " "
+        print(f"{mark} [{published}] {row['source']}: {row['title'] or '(no title)'}")
+        print(f"    {row['url']}")
+        if row["summary"]:
+            print(f"    {row['summary']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ニュースアーカイブの検索・取り込み")
+    parser.add_argument("--db", default=os.getenv("ARCHIVE_DB") or "data/archive.sqlite3",
+                        help="アーカイブのSQLiteファイル")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    search_parser = subparsers.add_parser("search", help="キーワードで検索")
+    search_parser.add_argument("query", nargs="?", default="")
+    search_parser.add_argument("--source", help="ソース名で絞り込み（例: ITmedia）")
+    search_parser.add_argument("--since", help="この日付以降に公開されたもの（例: 2025-11-01）")
+    search_parser.add_argument("--selected", action="store_true", help="通知したニュースのみ")
+    search_parser.add_argument("--limit", type=int, default=20)
+    search_parser.add_argument("--json", action="store_true", help="JSONで出力")
+
+    import_parser = subparsers.add_parser("import", help="history.jsonやJSONLを取り込む")
+    import_parser.add_argument("files", nargs="+")
+
+    export_parser = subparsers.add_parser("export-training", help="選定モデルの学習データを書き出す")
+    export_parser.add_argument("output")
+    export_parser.add_argument("--profile", help="プロファイル名で絞り込み（選定基準が異なるプロファイルを混ぜない）")
+
+    subparsers.add_parser("stats", help="件数を表示")
+
+    args = parser.parse_args(argv)
+    archive = NewsArchive(args.db)
+    try:
+        if args.command == "search":
+            results = archive.search(args.query, source=args.source, since=args.since,
+                                     selected_only=args.selected, limit=args.limit)
+            if args.json:
+                print(json.dumps(results, ensure_ascii=False, indent=2))
+            else:
+                _print_results(results)
+                print(f"\n{len(results)} result(s)")
+        elif args.command == "import":
+            for path in args.files:
+                if path.endswith(".jsonl"):
+                    count = archive.import_jsonl(path)
+                else:
+                    count = archive.import_history(path)
+                print(f"Imported {count} entries from {path}")
+        elif args.command == "export-training":
+            count = archive.export_training_data(args.output, profile=args.profile)
+            print(f"Exported {count} training examples to {args.output}")
+        elif args.command == "stats":
+            print(json.dumps(archive.stats(), ensure_ascii=False, indent=2))
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+from bs4 import BeautifulSoup
+from .fetchers.base import NewsItem
+
+
+class ContentExtractor:
+    """記事ページをダウンロードして本文を抽出するクラス"""
+
+    USER_AGENT = "Mozilla/5.0 (compatible; DailyTechNewsBot/1.0)"
+
+    # 本文ではない要素
+    NOISE_TAGS = ["script", "style", "noscript", "nav", "header", "footer",
+                  "aside", "form", "iframe", "svg", "button"]
+
+    def __init__(self, cache_dir: str = "data/content_cache", max_workers: int = 4,
+                 timeout: float = 10.0, token_budget: int = 1500, max_bytes: int = 2_000_000):
+        """
+        Args:
+            cache_dir: 抽出した本文のキャッシュディレクトリ
+            max_workers: 同時にダウンロードする記事数の上限
+            timeout: 1記事あたりのタイムアウト秒数
+            token_budget: プロンプトに含める本文のおおよそのトークン数上限
+            max_bytes: ダウンロードするHTMLの最大サイズ
+        """
+        self.cache_dir = cache_dir
+        self.index_file = os.path.join(cache_dir, "index.json")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.token_budget = token_budget
+        self.max_bytes = max_bytes
+        self.index = self._load_index()
+
+    def extract_all(self, news_items: List[NewsItem]) -> int:
+        """
+        各ニュースの本文を取得して news_item.content に設定
+        キャッシュにない記事だけを並列にダウンロードする
+        戻り値: 本文を設定できた記事数
+        """
+        # 同じURLの記事が複数あっても1度だけ取得する
+        urls = list(dict.fromkeys(item.url for item in news_items))
+        texts = {}
+        to_fetch = []
+        for url in urls:
+            cached = self._read_cached(url)
+            if cached is not None:
+                texts[url] = cached
+            else:
+                to_fetch.append(url)
+        cache_hits = len(texts)
+
+        if to_fetch:
+            workers = min(self.max_workers, len(to_fetch))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extractor") as executor:
+                fetched = list(executor.map(self._fetch_text, to_fetch))
+
+            # インデックスの更新はメインスレッドでまとめて行う
+            for url, text in zip(to_fetch, fetched):
+                if text:
+                    self._store(url, text)
+                    texts[url] = text
+            self._save_index()
+
+        print(f"  Extracted content: {len(texts)}/{len(urls)} articles ({cache_hits} from cache)")
+
+        for item in news_items:
+            if texts.get(item.url):
+                item.content = self.trim_to_budget(texts[item.url], self.token_budget)
+
+        return sum(1 for item in news_items if item.content)
+
+    def cleanup_old_entries(self, days: int = 30):
+        """指定日数より古いキャッシュエントリと、参照されなくなった本文を削除"""
+        cutoff_date = datetime.now() - timedelta(days=days)
+        urls_to_remove = []
+        for url, entry in self.index.items():
+            try:
+                if datetime.fromisoformat(entry["fetched_at"]) < cutoff_date:
+                    urls_to_remove.append(url)
+            except Exception:
+                urls_to_remove.append(url)
+
+        if not urls_to_remove:
+            return
+
+        for url in urls_to_remove:
+            del self.index[url]
+        self._save_index()
+
+        # 同じ本文を複数のURLが共有している場合があるため、参照が残っていないものだけ消す
+        alive = {entry["sha256"] for entry in self.index.values()}
+        removed_blobs = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".txt") and name[:-4] not in alive:
+                    os.remove(os.path.join(root, name))
+                    removed_blobs += 1
+
+        print(f"Cleaned up {len(urls_to_remove)} old content cache entries ({removed_blobs} files)")
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """おおよそのトークン数（英数字は4文字で1トークン、日本語などは1文字1トークン）"""
+        ascii_chars = sum(1 for c in text if ord(c) < 128)
+        return ascii_chars // 4 + (len(text) - ascii_chars)
+
+    @classmethod
+    def trim_to_budget(cls, text: str, token_budget: int) -> str:
+        """段落単位でトークン予算に収まるように切り詰める"""
+        kept = []
+        used = 0
+        for paragraph in text.split("\n"):
+            tokens = cls.estimate_tokens(paragraph)
+            if used + tokens > token_budget:
+                if not kept:
+                    # 最初の段落だけで予算を超える場合は文字数で切る
+                    ratio = token_budget / max(tokens, 1)
+                    kept.append(paragraph[:int(len(paragraph) * ratio)] + "…")
+                break
+            kept.append(paragraph)
+            used += tokens
+        return "\n".join(kept)
+
+    def _fetch_text(self, url: str) -> str:
+        """記事をダウンロードして本文を抽出（失敗時は空文字）"""
+        try:
+            with requests.get(url, timeout=self.timeout, stream=True,
+                              headers={"User-Agent": self.USER_AGENT}) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "")
+                if "html" not in content_type:
+                    return ""
+
+                chunks = []
+                size = 0
+                for chunk in response.iter_content(chunk_size=65536):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= self.max_bytes:
+                        break
+
+            # バイト列のまま渡し、metaタグの文字コード（Shift_JISなど）をBeautifulSoupに判定させる
+            return self.extract_text(b"".join(chunks))
+        except Exception as e:
+            print(f"    Error extracting content from {url}: {e}")
+            return ""
+
+    @classmethod
+    def extract_text(cls, html) -> str:
+        """HTMLから本文らしい段落を抽出"""
+        soup = BeautifulSoup(html, "html.parser")
+        for tag in soup(cls.NOISE_TAGS):
+            tag.decompose()
+
+        root = soup.find("article") or soup.find("main") or soup.body or soup
+
+        # 段落テキストの合計が最も長い親要素を本文とみなす
+        scores = {}
+        for p in root.find_all("p"):
+            text = p.get_text(" ", strip=True)
+            if len(text) < 20:
+                continue
+            parent = p.parent
+            paragraphs = scores.setdefault(id(parent), [])
+            paragraphs.append(text)
+
+        if not scores:
+            return root.get_text("\n", strip=True)
+
+        best = max(scores.values(), key=lambda paragraphs: sum(len(t) for t in paragraphs))
+        return "\n".join(best)
+
+    def _read_cached(self, url: str) -> Optional[str]:
+        """キャッシュ済みの本文を返す（なければNone）"""
+        entry = self.index.get(url)
+        if not entry:
+            return None
+        try:
+            with open(self._blob_path(entry["sha256"]), 'r', encoding='utf-8') as f:
+                return f.read()
+        except Exception:
+            return None
+
+    def _store(self, url: str, text: str):
+        """本文を内容のハッシュをキーにして保存"""
+        sha = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        path = self._blob_path(sha)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        self.index[url] = {"sha256": sha, "fetched_at": datetime.now().isoformat()}
+
+    def _blob_path(self, sha: str) -> str:
+        return os.path.join(self.cache_dir, sha[:2], f"{sha}.txt")
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """URL -> 本文ハッシュのインデックスを読み込み"""
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Error loading content cache index: {e}")
+        return {}
+
+    def _save_index(self):
+        """インデックスを保存"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self.index_file, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"Error saving content cache index: {e}")
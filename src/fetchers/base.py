@@ -1,18 +1,21 @@
+import feedparser
+import requests
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 
 
 class NewsItem:
     """ニュース記事を表すデータクラス"""
     def __init__(self, title: str, url: str, published_date: datetime,
-                 source: str, description: str = "", score: int = 0):
+                 source: str, description: str = "", score: int = 0, content: str = ""):
         self.title = title
         self.url = url
         self.published_date = published_date
         self.source = source
         self.description = description
         self.score = score  # サイト固有のスコア（HNのポイントなど）
+        self.content = content  # 記事ページから抽出した本文（ContentExtractorが設定）
 
     def to_dict(self) -> Dict:
         return {
@@ -24,10 +27,30 @@ class NewsItem:
             "score": self.score
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "NewsItem":
+        """to_dict() の出力から復元"""
+        return cls(
+            title=data.get("title", ""),
+            url=data["url"],
+            published_date=datetime.fromisoformat(data["published_date"]),
+            source=data.get("source", ""),
+            description=data.get("description", ""),
+            score=data.get("score", 0),
+            content=data.get("content", "")
+        )
+
 
 class NewsFetcher(ABC):
     """ニュースフェッチャーの基底クラス"""
 
+    # フィード取得のタイムアウト秒数
+    TIMEOUT = 10
+
+    # 直前のfetch()で発生したエラー（成功時はNone）
+    # fetch()は例外を送出せず[]を返すため、空のフィードと取得失敗をこれで区別する
+    last_error: Optional[Exception] = None
+
     @abstractmethod
     def fetch(self) -> List[NewsItem]:
         """ニュースを取得する"""
@@ -38,3 +61,15 @@ class NewsFetcher(ABC):
     def source_name(self) -> str:
         """ソース名を返す"""
         pass
+
+    def _parse_feed(self, url: str) -> feedparser.FeedParserDict:
+        """
+        タイムアウト付きでRSS/Atomフィードを取得してパース
+        feedparser.parse(url) はタイムアウトがなく、取得失敗も例外にならないため使わない
+        """
+        response = requests.get(url, timeout=self.TIMEOUT)
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
+        if feed.bozo and not feed.entries:
+            raise ValueError(f"Invalid feed: {feed.bozo_exception}")
+        return feed
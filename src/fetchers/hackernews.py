@@ -14,14 +14,15 @@ class HackerNewsFetcher(NewsFetcher):
         return "Hacker News"
 
     def fetch(self) -> List[NewsItem]:
+        self.last_error = None
         try:
             # トップストーリーのIDを取得
-            response = requests.get(f"{self.API_BASE}/topstories.json", timeout=10)
+            response = requests.get(f"{self.API_BASE}/topstories.json", timeout=self.TIMEOUT)
             story_ids = response.json()[:30]  # 上位30件
 
             news_items = []
             for story_id in story_ids:
-                story_response = requests.get(f"{self.API_BASE}/item/{story_id}.json", timeout=10)
+                story_response = requests.get(f"{self.API_BASE}/item/{story_id}.json", timeout=self.TIMEOUT)
                 story = story_response.json()
 
                 if story and story.get('type') == 'story' and story.get('url'):
@@ -38,4 +39,5 @@ class HackerNewsFetcher(NewsFetcher):
             return news_items
         except Exception as e:
             print(f"Error fetching from {self.source_name}: {e}")
+            self.last_error = e
             return []
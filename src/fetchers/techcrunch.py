@@ -1,4 +1,3 @@
-import feedparser
 from datetime import datetime
 from typing import List
 from .base import NewsFetcher, NewsItem
@@ -14,8 +13,9 @@ class TechCrunchFetcher(NewsFetcher):
         return "TechCrunch"
 
     def fetch(self) -> List[NewsItem]:
+        self.last_error = None
         try:
-            feed = feedparser.parse(self.RSS_URL)
+            feed = self._parse_feed(self.RSS_URL)
             news_items = []
 
             for entry in feed.entries[:20]:  # 最新20件を取得
@@ -31,4 +31,5 @@ class TechCrunchFetcher(NewsFetcher):
             return news_items
         except Exception as e:
             print(f"Error fetching from {self.source_name}: {e}")
+            self.last_error = e
             return []
@@ -0,0 +1,116 @@
+import time
+import requests
+from urllib3.exceptions import NewConnectionError
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+# リトライ対象のHTTPステータス
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def retry_delay(response: Optional[requests.Response], attempt: int,
+                backoff: float = 2.0) -> Optional[float]:
+    """
+    リトライまでの待機秒数を返す（リトライすべきでない場合はNone）
+
+    response: 失敗したレスポンス（接続エラー・タイムアウトの場合はNone）
+    attempt: 0始まりの試行回数
+    """
+    default = backoff * (2 ** attempt)
+    if response is None:
+        return default
+
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        return _parse_retry_after(retry_after, default)
+
+    # GitHubのレート制限（プライマリ）は403/429 + X-RateLimit-Remaining: 0 で返る
+    if response.status_code in (403, 429) and response.headers.get("X-RateLimit-Remaining") == "0":
+        reset = response.headers.get("X-RateLimit-Reset")
+        if reset and reset.isdigit():
+            return max(0.0, int(reset) - time.time()) + 1
+        return default
+
+    if response.status_code in RETRYABLE_STATUS:
+        return default
+
+    return None
+
+
+def time_left(deadline: Optional[float]) -> Optional[float]:
+    """
+    期限（time.monotonic()の値）までの残り秒数（期限なしの場合はNone）
+    期限を過ぎている場合はrequests.Timeoutを送出
+    """
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise requests.Timeout("deadline exceeded")
+    return remaining
+
+
+def request_with_retry(method: str, url: str, max_retries: int = 3, backoff: float = 2.0,
+                       max_wait: float = 60.0, deadline: Optional[float] = None,
+                       idempotent: bool = True, **kwargs) -> requests.Response:
+    """
+    リトライ付きでHTTPリクエストを送信
+
+    idempotent: Falseの場合（Slackへの投稿など）は、サーバーに届いていないことが確実な失敗
+                （接続できなかった・429）のみリトライする。タイムアウトや5xxは受理済みの
+                可能性があり、リトライすると二重に投稿されるため最後の結果をそのまま返す
+
+    待機時間がmax_waitを超える場合は待たずに最後のレスポンス/例外を返す
+    deadline: time.monotonic()の期限。各リクエストのタイムアウトを残り時間に収め、
+              期限までにリトライできない場合は待たずに打ち切る
+    """
+    request_timeout = kwargs.pop("timeout", None)
+    for attempt in range(max_retries + 1):
+        response = None
+        error = None
+        try:
+            remaining = time_left(deadline)
+            timeout = request_timeout
+            if remaining is not None:
+                timeout = remaining if timeout is None else min(timeout, remaining)
+            response = requests.request(method, url, timeout=timeout, **kwargs)
+            if response.status_code < 400:
+                return response
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+
+        delay = retry_delay(response, attempt, backoff)
+        if delay is None or attempt == max_retries or delay > max_wait:
+            break
+        if not idempotent and not _not_delivered(response, error):
+            break
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            break
+        print(f"  Retrying {method} {url} in {delay:.1f}s ({error or response.status_code})")
+        time.sleep(delay)
+
+    if error is not None:
+        raise error
+    return response
+
+
+def _not_delivered(response: Optional[requests.Response], error: Optional[Exception]) -> bool:
+    """リクエストがサーバーで処理されていないことが確実か"""
+    if error is not None:
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        # 接続の確立に失敗した場合（接続拒否など）。送信後の切断は処理済みの可能性がある
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+    return response.status_code == 429
+
+
+def _parse_retry_after(value: str, default: float) -> float:
+    """Retry-Afterヘッダー（秒数またはHTTP日付）を秒数に変換"""
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return default
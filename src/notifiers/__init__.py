@@ -0,0 +1,14 @@
+from .base import Notifier, Digest, deliver_all
+from .github import GitHubNotifier, DeliveryError
+from .webhook import WebhookNotifier
+from .static import StaticFileNotifier
+
+__all__ = [
+    'Notifier',
+    'Digest',
+    'deliver_all',
+    'GitHubNotifier',
+    'DeliveryError',
+    'WebhookNotifier',
+    'StaticFileNotifier'
+]
@@ -0,0 +1,193 @@
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime
+from functools import cached_property
+from typing import List, Dict, Optional
+
+
+class Digest:
+    """
+    1回の実行分のニュースダイジェスト
+    Markdownのレンダリングは1度だけ行い、各通知先で共有する
+    """
+
+    # ソースごとの絵文字マッピング
+    SOURCE_EMOJIS = {
+        "TechCrunch": "🚀",
+        "Hacker News": "📙",
+        "ITmedia": "🇯🇵",
+        "ZDNet Japan": "📰",
+        "日経xTECH": "📈",
+        "Publickey": "🔑",
+    }
+
+    def __init__(self, news_items: List[Dict], generated_at: Optional[datetime] = None):
+        """
+        Args:
+            news_items: NewsItemとその要約・コメントを含む辞書のリスト
+            generated_at: ダイジェストの作成日時（省略時は現在時刻）
+        """
+        self.news_items = news_items
+        self.generated_at = generated_at or datetime.now()
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.news_items
+
+    @property
+    def date_str(self) -> str:
+        return self.generated_at.strftime('%Y年%m月%d日')
+
+    @property
+    def datetime_str(self) -> str:
+        return self.generated_at.strftime('%Y年%m月%d日 %H時')
+
+    @property
+    def title(self) -> str:
+        if self.is_empty:
+            return f"ℹ️ 本日のニュース - {self.datetime_str}"
+        return f"📰 技術ニュースダイジェスト - {self.datetime_str}"
+
+    @cached_property
+    def items_markdown(self) -> str:
+        """各ニュースのMarkdown（見出し・フッターなし）"""
+        lines = []
+        for idx, item in enumerate(self.news_items, 1):
+            news_item = item['news']
+            summary = item.get('summary', '要約なし')
+            comment = item.get('comment', '')
+            emoji = self.SOURCE_EMOJIS.get(news_item.source, "🔗")
+
+            lines.extend([
+                f"## {idx}. {news_item.title}",
+                f"",
+                f"{emoji} **ソース:** {news_item.source}  ",
+                f"🔗 **リンク:** {news_item.url}",
+                f"",
+                f"### 📝 要約",
+                f"{summary}",
+                f""
+            ])
+
+            if comment:
+                lines.extend([
+                    f"### 💬 コメント",
+                    f"> {comment}",
+                    f""
+                ])
+
+            if idx < len(self.news_items):
+                lines.extend([f"---", f""])
+
+        return "\n".join(lines)
+
+    @cached_property
+    def markdown(self) -> str:
+        """ダイジェスト全体のMarkdown"""
+        if self.is_empty:
+            return f"""# ℹ️ 本日のニュース
+
+**日時:** {self.datetime_str}
+
+本日は新しいニュースがありませんでした。
+
+---
+
+🤖 *Powered by Claude AI*
+"""
+
+        lines = [
+            f"# 📰 本日の技術ニュースダイジェスト",
+            f"",
+            f"**日付:** {self.date_str}  ",
+            f"**件数:** {len(self.news_items)}件",
+            f"",
+            f"---",
+            f"",
+            self.items_markdown,
+            f"---",
+            f"",
+            f"🤖 *Powered by Claude AI*"
+        ]
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict:
+        """JSONで送信・保存するための辞書"""
+        return {
+            "title": self.title,
+            "generated_at": self.generated_at.isoformat(),
+            "items": [
+                dict(item['news'].to_dict(),
+                     summary=item.get('summary', ''),
+                     comment=item.get('comment', ''))
+                for item in self.news_items
+            ],
+            "markdown": self.markdown,
+        }
+
+
+class Notifier(ABC):
+    """通知先の基底クラス"""
+
+    # deliver_allでこの通知先を待つ最大秒数
+    timeout: float = 30.0
+
+    @abstractmethod
+    def send(self, digest: Digest, deadline: Optional[float] = None):
+        """
+        ダイジェストを送信する（失敗時は例外を送出）
+        deadline: time.monotonic()の期限。スレッドは外から止められないため、
+                  各通知先がリクエストのタイムアウトやリトライの待機をこの期限内に収める
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """通知先の名前を返す"""
+        pass
+
+    def flush_outbox(self, deadline: Optional[float] = None) -> int:
+        """
+        前回送信できなかった分を再送する（outboxを持つ通知先のみ）
+        戻り値: 送信できずに残った件数
+        """
+        return 0
+
+
+def deliver_all(digest: Digest, notifiers: List[Notifier]) -> Dict[str, bool]:
+    """
+    ダイジェストを全ての通知先に並列で送信
+    各通知先は独自のタイムアウトを持ち、1つの失敗が他に影響しない
+    タイムアウトは期限としてsend()に渡し、通知先自身が期限内に処理を打ち切る
+
+    戻り値: 通知先名 -> 成功したかどうか
+    """
+    results = {}
+    if not notifiers:
+        return results
+
+    executor = ThreadPoolExecutor(max_workers=len(notifiers), thread_name_prefix="notifier")
+    started = time.monotonic()
+    futures = [
+        (notifier, executor.submit(notifier.send, digest, started + notifier.timeout))
+        for notifier in notifiers
+    ]
+
+    for notifier, future in futures:
+        remaining = max(0.0, started + notifier.timeout - time.monotonic())
+        try:
+            future.result(timeout=remaining)
+            results[notifier.name] = True
+            print(f"  - {notifier.name}: ✓ ({time.monotonic() - started:.1f}s)")
+        except FutureTimeoutError:
+            results[notifier.name] = False
+            print(f"  - {notifier.name}: ✗ Timed out after {notifier.timeout:g}s")
+        except Exception as e:
+            results[notifier.name] = False
+            print(f"  - {notifier.name}: ✗ Error: {e}")
+
+    # タイムアウトした通知先の完了は待たない（期限を過ぎた通知先は自身で処理を打ち切る）
+    executor.shutdown(wait=False, cancel_futures=True)
+    return results
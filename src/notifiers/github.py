@@ -0,0 +1,366 @@
+import json
+import os
+import time
+import requests
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Callable, Tuple
+from ..http_retry import retry_delay, request_with_retry, time_left
+from ..outbox import Outbox
+from .base import Notifier, Digest
+
+
+class DeliveryError(Exception):
+    """GitHubへの送信失敗（permanent=Trueはリトライしても成功しない失敗）"""
+
+    def __init__(self, message: str, permanent: bool = False, status: Optional[int] = None):
+        super().__init__(message)
+        self.permanent = permanent
+        self.status = status
+
+
+class GitHubNotifier(Notifier):
+    """GitHub Issueを作成して日次ニュースを通知"""
+
+    # リトライ待ちを含めた期限（期限を過ぎたらリトライを打ち切り、outboxに残して次回再送する）
+    timeout = 120.0
+
+    # 再送しても成功しないステータス（内容の不備・削除済み）
+    # 401/403/404はトークンの期限切れや設定ミス、ヘッダーのない二次レート制限でも返るため、
+    # 実行内ではリトライせずoutboxに残し、max_attemptsまで次回以降に再送する
+    PERMANENT_STATUS = {410, 422}
+
+    # 当日のIssueに追記できない場合（削除・ロックなど）に新規Issueの作成に切り替えるステータス
+    APPEND_FALLBACK_STATUS = {404, 410, 422}
+
+    # 通知モード
+    MODE_ISSUE = "issue"    # 実行ごとに新しいIssueを作成
+    MODE_APPEND = "append"  # 当日のIssueにコメントとして追記
+
+    def __init__(self, github_token: str, repo_owner: str, repo_name: str,
+                 mode: str = MODE_ISSUE, cache_file: str = "data/issue_cache.json",
+                 outbox_dir: str = "data/outbox/github", max_retries: int = 3,
+                 max_wait: float = 60.0, api_base: str = "https://api.github.com"):
+        """
+        Args:
+            github_token: GitHub Personal Access Token or GITHUB_TOKEN
+            repo_owner: リポジトリのオーナー名
+            repo_name: リポジトリ名
+            mode: "issue"（毎回新規Issue）または "append"（当日のIssueに追記）
+            cache_file: appendモードで当日のIssue番号を保存するファイル
+            outbox_dir: 未送信ダイジェストを保存するディレクトリ
+            max_retries: 1回の実行内でのリトライ回数
+            max_wait: 1回のリトライで待つ最大秒数（超える場合は次回の実行で再送）
+            api_base: GitHub APIのベースURL（GitHub Enterpriseやローカルのスタブ用）
+        """
+        if mode not in (self.MODE_ISSUE, self.MODE_APPEND):
+            raise ValueError(f"Unknown notifier mode: {mode}")
+
+        self.github_token = github_token
+        self.repo_owner = repo_owner
+        self.repo_name = repo_name
+        self.mode = mode
+        self.cache_file = cache_file
+        self.outbox = Outbox(outbox_dir)
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.api_url = f"{api_base.rstrip('/')}/repos/{repo_owner}/{repo_name}/issues"
+
+    @property
+    def name(self) -> str:
+        return f"GitHub ({self.repo_owner}/{self.repo_name})"
+
+    def send_daily_digest(self, news_items: List[Dict]):
+        """
+        日次ニュースダイジェストをGitHub Issueとして作成
+        news_items: NewsItemとその要約・コメントを含む辞書のリスト
+        """
+        self.send(Digest(news_items))
+
+    def send(self, digest: Digest, deadline: Optional[float] = None):
+        """
+        ダイジェストをGitHub Issueとして送信
+
+        ダイジェストはまずoutboxに保存してから送信するため、
+        送信に失敗しても次回の実行で再送される
+        """
+        if not digest.is_empty or self.mode == self.MODE_ISSUE:
+            self._enqueue_digest(digest)
+        else:
+            print("No new news: skipped posting to GitHub (append mode)")
+
+        remaining, dropped = self._flush(deadline)
+        if remaining or dropped:
+            raise DeliveryError(f"{remaining} digest(s) kept in outbox, {dropped} dropped")
+
+    def flush_outbox(self, deadline: Optional[float] = None) -> int:
+        """
+        outboxに残っている未送信ダイジェストを古い順に送信
+        戻り値: 送信できずに残ったエントリ数
+        """
+        if deadline is None:
+            deadline = time.monotonic() + self.timeout
+        remaining, _ = self._flush(deadline)
+        return remaining
+
+    def _flush(self, deadline: Optional[float] = None) -> Tuple[int, int]:
+        """
+        outboxのエントリを古い順に送信
+        戻り値: (次回に再送するエントリ数, 再送しても成功しないため failed/ に移動したエントリ数)
+        """
+        pending = self.outbox.pending()
+        dropped = 0
+        for idx, entry in enumerate(pending):
+            if entry["attempts"] > 0:
+                print(f"Replaying outbox entry {entry['id']} (attempt {entry['attempts'] + 1})")
+            try:
+                self._deliver(entry, deadline)
+                self.outbox.remove(entry["id"])
+            except DeliveryError as e:
+                print(f"Error delivering to GitHub: {e}")
+                self.outbox.record_failure(entry, str(e), permanent=e.permanent)
+                if e.permanent:
+                    # 再送しても成功しないエントリで後続のダイジェストを止めない
+                    dropped += 1
+                    continue
+                # 順序を保つため、一時的な失敗の場合は残りを次回に回す
+                remaining = len(pending) - idx
+                print(f"  {remaining} digest(s) kept in outbox for the next run")
+                return remaining, dropped
+        return 0, dropped
+
+    def _enqueue_digest(self, digest: Digest) -> Dict:
+        """ダイジェストをoutboxに保存"""
+        title = digest.title
+        body = digest.markdown
+        labels = ["daily-news", "automated"]
+        if digest.is_empty:
+            labels.append("no-news")
+        elif self.mode == self.MODE_APPEND:
+            title = self._daily_issue_title(digest.date_str)
+
+        now = digest.generated_at
+        payload = {
+            "mode": self.mode,
+            "date_key": now.strftime('%Y-%m-%d'),
+            "title": title,
+            "body": body,
+            "labels": labels,
+            "news_count": len(digest.news_items),
+        }
+        if self.mode == self.MODE_APPEND:
+            payload["update_body"] = self._build_update_body(digest, now.strftime('%H時'))
+
+        entry_id = Outbox.make_id(self.repo_owner, self.repo_name, title, body)
+        # 再送時に送信済みかどうかを判定するためのマーカー
+        marker = self._marker(entry_id)
+        payload["body"] += f"\n\n{marker}"
+        if "update_body" in payload:
+            payload["update_body"] += f"\n\n{marker}"
+
+        return self.outbox.add(entry_id, payload)
+
+    def _deliver(self, entry: Dict, deadline: Optional[float] = None):
+        """outboxのエントリを1件送信（失敗時はDeliveryError）"""
+        payload = entry["payload"]
+
+        if payload["mode"] == self.MODE_APPEND:
+            issue_number = self._find_issue_for_date(payload["date_key"], payload["title"], deadline)
+            if issue_number is not None:
+                try:
+                    comment = self._post_with_retry(
+                        entry,
+                        f"{self.api_url}/{issue_number}/comments",
+                        {"body": payload["update_body"]},
+                        lambda: self._find_delivered_comment(issue_number, entry, deadline),
+                        deadline
+                    )
+                    print(f"Successfully appended to GitHub Issue: {comment.get('html_url')}")
+                    print(f"  ({payload['news_count']} news items appended to #{issue_number})")
+                    return
+                except DeliveryError as e:
+                    if e.status not in self.APPEND_FALLBACK_STATUS:
+                        raise
+                    # キャッシュのIssueが使えない（削除・ロックなど）場合は新規作成にフォールバック
+                    print(f"Error appending to GitHub Issue #{issue_number}: {e}")
+                    self._save_issue_cache({})
+
+        issue = self._post_with_retry(
+            entry,
+            self.api_url,
+            {"title": payload["title"], "body": payload["body"], "labels": payload["labels"]},
+            lambda: self._find_delivered_issue(entry, deadline),
+            deadline
+        )
+        if payload["mode"] == self.MODE_APPEND:
+            self._save_issue_cache({payload["date_key"]: issue.get('number')})
+        print(f"Successfully created GitHub Issue: {issue.get('html_url')}")
+        print(f"  ({payload['news_count']} news items)")
+
+    def _post_with_retry(self, entry: Dict, url: str, json_body: Dict,
+                         find_delivered: Callable[[], Optional[Dict]],
+                         deadline: Optional[float] = None) -> Dict:
+        """
+        POSTをリトライ付きで送信
+        再送の前に送信済みかを確認し、同じダイジェストを二重に投稿しない
+        deadlineを過ぎる場合はリトライせず、一時的な失敗としてoutboxに残す
+        """
+        for attempt in range(self.max_retries + 1):
+            if entry["attempts"] > 0 or attempt > 0:
+                try:
+                    delivered = find_delivered()
+                except Exception as e:
+                    raise DeliveryError(f"could not verify previous delivery: {e}")
+                if delivered:
+                    print(f"  Outbox entry {entry['id']} was already delivered")
+                    return delivered
+
+            response = None
+            error = None
+            try:
+                remaining = time_left(deadline)
+            except requests.Timeout:
+                raise DeliveryError("deadline exceeded")
+            try:
+                timeout = 10 if remaining is None else min(10, remaining)
+                response = requests.post(url, json=json_body, headers=self._headers(), timeout=timeout)
+                if response.status_code < 400:
+                    return response.json()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            reason = str(error) if error else f"HTTP {response.status_code}: {response.text[:200]}"
+            status = response.status_code if response is not None else None
+            delay = retry_delay(response, attempt)
+            if delay is None:
+                raise DeliveryError(reason, permanent=status in self.PERMANENT_STATUS, status=status)
+            if attempt == self.max_retries or delay > self.max_wait:
+                raise DeliveryError(f"{reason} (retry in {delay:.0f}s)")
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise DeliveryError(f"{reason} (deadline exceeded before retry)")
+
+            print(f"  Retrying in {delay:.1f}s ({reason})")
+            time.sleep(delay)
+
+        raise DeliveryError("retries exhausted")
+
+    def _find_delivered_issue(self, entry: Dict, deadline: Optional[float] = None) -> Optional[Dict]:
+        """マーカーを含むIssueが既に作成されていればそれを返す"""
+        response = request_with_retry(
+            "GET", self.api_url,
+            params={"labels": "daily-news", "state": "all", "since": entry["created_at"], "per_page": 50},
+            headers=self._headers(), timeout=10, max_retries=self.max_retries,
+            max_wait=self.max_wait, deadline=deadline
+        )
+        response.raise_for_status()
+        marker = self._marker(entry["id"])
+        for issue in response.json():
+            if marker in (issue.get('body') or ''):
+                return issue
+        return None
+
+    def _find_delivered_comment(self, issue_number: int, entry: Dict,
+                                deadline: Optional[float] = None) -> Optional[Dict]:
+        """マーカーを含むコメントが既に投稿されていればそれを返す"""
+        response = request_with_retry(
+            "GET", f"{self.api_url}/{issue_number}/comments",
+            params={"since": entry["created_at"], "per_page": 100},
+            headers=self._headers(), timeout=10, max_retries=self.max_retries,
+            max_wait=self.max_wait, deadline=deadline
+        )
+        response.raise_for_status()
+        marker = self._marker(entry["id"])
+        for comment in response.json():
+            if marker in (comment.get('body') or ''):
+                return comment
+        return None
+
+    @staticmethod
+    def _marker(entry_id: str) -> str:
+        return f"<!-- daily-news-digest: {entry_id} -->"
+
+    def _daily_issue_title(self, today: str) -> str:
+        """appendモードで使う当日Issueのタイトル"""
+        return f"📰 技術ニュースダイジェスト - {today}"
+
+    def _find_issue_for_date(self, date_key: str, title: str,
+                             deadline: Optional[float] = None) -> Optional[int]:
+        """
+        指定日のIssue番号を取得（見つからない場合はNone、検索に失敗した場合はDeliveryError）
+        ローカルキャッシュを優先し、なければその日以降に更新されたIssue一覧から探す
+        """
+        cached = self._load_issue_cache().get(date_key)
+        if cached:
+            return cached
+
+        # キャッシュがない場合（別マシンでの実行など）は一覧APIで1回だけ探す
+        # 検索に失敗した場合に「当日のIssueなし」として新規作成すると同じ日のIssueが重複するため、
+        # 一時的な失敗としてoutboxに残す
+        try:
+            response = request_with_retry(
+                "GET", self.api_url,
+                params={
+                    "labels": "daily-news",
+                    "state": "open",
+                    "since": self._utc_day_start(date_key),
+                    "per_page": 30
+                },
+                headers=self._headers(), timeout=10, max_retries=self.max_retries,
+                max_wait=self.max_wait, deadline=deadline
+            )
+            response.raise_for_status()
+            issues = response.json()
+        except Exception as e:
+            raise DeliveryError(f"could not look up today's issue: {e}")
+
+        for issue in issues:
+            if issue.get('title') == title and 'pull_request' not in issue:
+                number = issue.get('number')
+                self._save_issue_cache({date_key: number})
+                return number
+
+        return None
+
+    @staticmethod
+    def _utc_day_start(date_key: str) -> str:
+        """ローカル時刻の日付（YYYY-MM-DD）の0時をUTCのISO 8601形式にする（APIのsinceはUTCとして扱われる）"""
+        day_start = datetime.strptime(date_key, '%Y-%m-%d').astimezone(timezone.utc)
+        return day_start.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def _load_issue_cache(self) -> Dict[str, int]:
+        """当日Issue番号のキャッシュを読み込み"""
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Error loading issue cache: {e}")
+        return {}
+
+    def _save_issue_cache(self, cache: Dict[str, int]):
+        """当日Issue番号のキャッシュを保存（古い日付のエントリは残さない）"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"Error saving issue cache: {e}")
+
+    def _headers(self) -> Dict[str, str]:
+        """GitHub APIリクエスト用のヘッダー"""
+        return {
+            "Authorization": f"token {self.github_token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+
+    def _build_update_body(self, digest: Digest, time_str: str) -> str:
+        """当日Issueへの追記コメントをMarkdownで生成"""
+        lines = [
+            f"# 🆕 追加ニュース ({time_str})",
+            f"",
+            f"**件数:** {len(digest.news_items)}件",
+            f"",
+            f"---",
+            f"",
+            digest.items_markdown
+        ]
+        return "\n".join(lines)
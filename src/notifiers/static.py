@@ -0,0 +1,150 @@
+import html
+import json
+import os
+from email.utils import format_datetime
+from typing import List, Dict, Optional
+from xml.sax.saxutils import escape
+from .base import Notifier, Digest
+
+
+class StaticFileNotifier(Notifier):
+    """ダイジェストを静的ファイル（Markdown/HTML/RSS）として書き出す"""
+
+    FORMATS = ("md", "html", "rss")
+
+    timeout = 10.0
+
+    def __init__(self, output_dir: str = "public", formats: List[str] = FORMATS,
+                 feed_size: int = 50, site_url: str = ""):
+        """
+        Args:
+            output_dir: 出力先ディレクトリ
+            formats: 出力する形式（"md", "html", "rss"）
+            feed_size: RSSフィードに残す記事数
+            site_url: RSSのチャンネルリンク（GitHub Pagesなどの公開URL）
+        """
+        unknown = set(formats) - set(self.FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown static formats: {', '.join(sorted(unknown))}")
+
+        self.output_dir = output_dir
+        self.formats = list(formats)
+        self.feed_size = feed_size
+        self.site_url = site_url
+
+    @property
+    def name(self) -> str:
+        return f"Static files ({self.output_dir})"
+
+    def send(self, digest: Digest, deadline: Optional[float] = None):
+        # ローカルへの書き込みのみのため期限は使わない
+        if digest.is_empty:
+            print(f"No new news: skipped writing static files")
+            return
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        if "md" in self.formats:
+            self._write("latest.md", digest.markdown)
+        if "html" in self.formats:
+            self._write("index.html", self._build_html(digest))
+        if "rss" in self.formats:
+            entries = self._update_feed_entries(digest)
+            self._write("feed.xml", self._build_rss(entries))
+
+    def _build_html(self, digest: Digest) -> str:
+        """ダイジェストをHTMLページとして生成"""
+        parts = [
+            "<!DOCTYPE html>",
+            '<html lang="ja">',
+            "<head>",
+            '<meta charset="utf-8">',
+            f"<title>{html.escape(digest.title)}</title>",
+            "</head>",
+            "<body>",
+            "<h1>📰 本日の技術ニュースダイジェスト</h1>",
+            f"<p><strong>日付:</strong> {html.escape(digest.date_str)} / "
+            f"<strong>件数:</strong> {len(digest.news_items)}件</p>",
+        ]
+
+        for idx, item in enumerate(digest.news_items, 1):
+            news_item = item['news']
+            emoji = Digest.SOURCE_EMOJIS.get(news_item.source, "🔗")
+            parts.extend([
+                "<article>",
+                f'<h2>{idx}. <a href="{html.escape(news_item.url)}">{html.escape(news_item.title)}</a></h2>',
+                f"<p>{emoji} {html.escape(news_item.source)}</p>",
+                f"<p>{html.escape(item.get('summary', ''))}</p>",
+            ])
+            if item.get('comment'):
+                parts.append(f"<blockquote>{html.escape(item['comment'])}</blockquote>")
+            parts.append("</article>")
+
+        parts.extend(["<p>🤖 <em>Powered by Claude AI</em></p>", "</body>", "</html>", ""])
+        return "\n".join(parts)
+
+    def _update_feed_entries(self, digest: Digest) -> List[Dict]:
+        """
+        フィード用の記事リストを更新
+        RSSは過去の記事も含める必要があるため、記事をfeed.jsonに蓄積する
+        """
+        feed_path = os.path.join(self.output_dir, "feed.json")
+        entries = []
+        if os.path.exists(feed_path):
+            try:
+                with open(feed_path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+            except Exception as e:
+                print(f"Error loading feed entries: {e}")
+
+        pub_date = format_datetime(digest.generated_at.astimezone())
+        new_entries = [{
+            "title": item['news'].title,
+            "url": item['news'].url,
+            "source": item['news'].source,
+            "summary": item.get('summary', ''),
+            "comment": item.get('comment', ''),
+            "pub_date": pub_date,
+        } for item in digest.news_items]
+
+        new_urls = {entry["url"] for entry in new_entries}
+        entries = new_entries + [entry for entry in entries if entry["url"] not in new_urls]
+        entries = entries[:self.feed_size]
+
+        self._write("feed.json", json.dumps(entries, ensure_ascii=False, indent=2))
+        return entries
+
+    def _build_rss(self, entries: List[Dict]) -> str:
+        """RSS 2.0フィードを生成"""
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<rss version="2.0">',
+            "<channel>",
+            "<title>技術ニュースダイジェスト</title>",
+            f"<link>{escape(self.site_url)}</link>",
+            "<description>Claude AIが選んだ技術ニュース</description>",
+            "<language>ja</language>",
+        ]
+        for entry in entries:
+            description = entry["summary"]
+            if entry["comment"]:
+                description += f"\n\n💬 {entry['comment']}"
+            lines.extend([
+                "<item>",
+                f"<title>{escape(entry['title'])}</title>",
+                f"<link>{escape(entry['url'])}</link>",
+                f"<guid>{escape(entry['url'])}</guid>",
+                f"<category>{escape(entry['source'])}</category>",
+                f"<description>{escape(description)}</description>",
+                f"<pubDate>{entry['pub_date']}</pubDate>",
+                "</item>",
+            ])
+        lines.extend(["</channel>", "</rss>", ""])
+        return "\n".join(lines)
+
+    def _write(self, filename: str, content: str):
+        """一時ファイル経由で書き込み（公開中のファイルを壊さない）"""
+        path = os.path.join(self.output_dir, filename)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
@@ -0,0 +1,67 @@
+from typing import Dict, Optional
+from ..http_retry import request_with_retry
+from .base import Notifier, Digest
+
+
+class WebhookNotifier(Notifier):
+    """Slack Incoming Webhookまたは任意のHTTPエンドポイントにダイジェストを送信"""
+
+    FORMAT_SLACK = "slack"  # Slack Incoming Webhook形式（{"text": ..., "blocks": [...]}）
+    FORMAT_JSON = "json"    # Digest.to_dict()をそのままPOST
+
+    timeout = 30.0
+
+    def __init__(self, url: str, format: str = FORMAT_SLACK, request_timeout: float = 10.0):
+        """
+        Args:
+            url: 送信先のWebhook URL
+            format: "slack" または "json"
+            request_timeout: 1リクエストあたりのタイムアウト秒数
+        """
+        if format not in (self.FORMAT_SLACK, self.FORMAT_JSON):
+            raise ValueError(f"Unknown webhook format: {format}")
+
+        self.url = url
+        self.format = format
+        self.request_timeout = request_timeout
+
+    @property
+    def name(self) -> str:
+        return "Slack" if self.format == self.FORMAT_SLACK else "Webhook"
+
+    def send(self, digest: Digest, deadline: Optional[float] = None):
+        # ニュースがない実行ではチャンネルに投稿しない
+        if digest.is_empty:
+            print(f"No new news: skipped posting to {self.name}")
+            return
+
+        payload = self._build_slack_payload(digest) if self.format == self.FORMAT_SLACK else digest.to_dict()
+        # 投稿は冪等ではないため、受理済みの可能性がある失敗（タイムアウト・5xx）は再送しない
+        response = request_with_retry(
+            "POST", self.url,
+            json=payload,
+            timeout=self.request_timeout,
+            max_retries=2,
+            max_wait=self.timeout / 3,
+            deadline=deadline,
+            idempotent=False
+        )
+        response.raise_for_status()
+
+    def _build_slack_payload(self, digest: Digest) -> Dict:
+        """Slack用のメッセージ（mrkdwn）を生成"""
+        blocks = [{
+            "type": "header",
+            "text": {"type": "plain_text", "text": digest.title}
+        }]
+
+        for idx, item in enumerate(digest.news_items, 1):
+            news_item = item['news']
+            emoji = Digest.SOURCE_EMOJIS.get(news_item.source, "🔗")
+            text = f"*{idx}. <{news_item.url}|{news_item.title}>*\n{emoji} {news_item.source}\n{item.get('summary', '')}"
+            if item.get('comment'):
+                text += f"\n> {item['comment']}"
+            # Slackのsectionテキストは3000文字まで
+            blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": text[:3000]}})
+
+        return {"text": digest.title, "blocks": blocks}
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import List, Dict
+
+
+class Outbox:
+    """送信前のダイジェストをローカルに保存し、送信成功まで保持するクラス"""
+
+    def __init__(self, outbox_dir: str = "data/outbox", max_attempts: int = 24):
+        """
+        Args:
+            outbox_dir: 未送信エントリを保存するディレクトリ
+            max_attempts: この回数失敗したエントリは failed/ に移動して再送をやめる
+        """
+        self.outbox_dir = outbox_dir
+        self.failed_dir = os.path.join(outbox_dir, "failed")
+        self.max_attempts = max_attempts
+        self._last_seq = 0
+
+    @staticmethod
+    def make_id(*parts: str) -> str:
+        """内容から決定的なエントリIDを生成（同じ内容を二重に登録しない）"""
+        digest = hashlib.sha256("\0".join(parts).encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def add(self, entry_id: str, payload: Dict) -> Dict:
+        """エントリを保存（既に存在する場合は既存のエントリを返す）"""
+        path = self._path(entry_id)
+        if os.path.exists(path):
+            existing = self._read(path)
+            if existing is not None:
+                return existing
+
+        # created_atは秒単位のため、同じ秒に追加したエントリの順序はseq（ナノ秒）で決める
+        self._last_seq = max(time.time_ns(), self._last_seq + 1)
+        entry = {
+            "id": entry_id,
+            "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "seq": self._last_seq,
+            "attempts": 0,
+            "last_error": None,
+            "payload": payload,
+        }
+        self._write(path, entry)
+        return entry
+
+    def pending(self) -> List[Dict]:
+        """未送信エントリを作成順に返す"""
+        if not os.path.isdir(self.outbox_dir):
+            return []
+
+        entries = []
+        for name in os.listdir(self.outbox_dir):
+            if not name.endswith(".json"):
+                continue
+            entry = self._read(os.path.join(self.outbox_dir, name))
+            if entry is not None:
+                entries.append(entry)
+        return sorted(entries, key=lambda e: (e["created_at"], e.get("seq", 0)))
+
+    def record_failure(self, entry: Dict, error: str, permanent: bool = False):
+        """
+        送信失敗を記録（上限を超えたら failed/ に移動）
+        permanent: 再送しても成功しない失敗の場合は回数によらずすぐに failed/ に移動
+        """
+        entry["attempts"] += 1
+        entry["last_error"] = error
+        path = self._path(entry["id"])
+
+        if permanent or entry["attempts"] >= self.max_attempts:
+            os.makedirs(self.failed_dir, exist_ok=True)
+            self._write(path, entry)
+            shutil.move(path, os.path.join(self.failed_dir, os.path.basename(path)))
+            reason = "permanent failure" if permanent else f"{entry['attempts']} attempts"
+            print(f"Outbox entry {entry['id']} moved to {self.failed_dir} after {reason}")
+            return
+
+        self._write(path, entry)
+
+    def remove(self, entry_id: str):
+        """送信済みエントリを削除"""
+        try:
+            os.remove(self._path(entry_id))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, entry_id: str) -> str:
+        return os.path.join(self.outbox_dir, f"{entry_id}.json")
+
+    def _read(self, path: str):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error loading outbox entry {path}: {e}")
+            return None
+
+    def _write(self, path: str, entry: Dict):
+        """一時ファイル経由で書き込み（途中で落ちても壊れたエントリを残さない）"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
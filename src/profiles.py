@@ -0,0 +1,127 @@
+import json
+import os
+import re
+from collections import ChainMap
+from typing import List, Dict, Optional, Mapping
+
+
+class Profile:
+    """
+    ダイジェストの配信先（チーム）ごとの設定
+    ニュースの取得・本文抽出・要約は全プロファイルで共有し、選定と通知だけをプロファイルごとに行う
+    """
+
+    def __init__(self, name: str, criteria: Optional[List[str]] = None, top_n: int = 5,
+                 sources: Optional[List[str]] = None, repo: Optional[str] = None,
+                 notifiers: Optional[List[str]] = None, settings: Optional[Dict[str, str]] = None,
+                 data_dir: Optional[str] = None, static_dir: Optional[str] = None):
+        """
+        Args:
+            name: プロファイル名（英数字・ハイフン・アンダースコア）
+            criteria: AIの選定基準（省略時はデフォルトの基準）
+            top_n: 選定する件数
+            sources: 対象とするソース名（省略時は全ソース）
+            repo: 通知先のリポジトリ（"owner/repo"、省略時はGITHUB_REPOSITORY）
+            notifiers: 通知先（"github", "webhook", "static"）
+            settings: 通知先の設定（WEBHOOK_URLなど。環境変数より優先）
+            data_dir: 履歴・outboxなどの保存先（省略時は data/profiles/<name>）
+            static_dir: 静的ファイルの出力先（省略時は <STATIC_OUTPUT_DIR>/<name>。settingsで上書き可）
+        """
+        if not re.fullmatch(r"[A-Za-z0-9_-]+", name):
+            raise ValueError(f"Invalid profile name: {name!r}")
+        if top_n < 1:
+            raise ValueError(f"top_n must be positive in profile {name!r}")
+
+        self.name = name
+        self.criteria = criteria
+        self.top_n = top_n
+        self.sources = set(sources) if sources else None
+        self.repo = repo
+        self.notifiers = notifiers or ["github"]
+        self.settings = settings or {}
+        self.data_dir = data_dir or os.path.join("data", "profiles", name)
+        self.static_dir = static_dir
+
+    @property
+    def history_file(self) -> str:
+        return os.path.join(self.data_dir, "history.json")
+
+    def accepts(self, source: str) -> bool:
+        """このプロファイルの対象ソースかどうか"""
+        return self.sources is None or source in self.sources
+
+    def notifier_settings(self, environ: Mapping[str, str] = os.environ) -> Mapping[str, str]:
+        """
+        通知先の設定（プロファイルの設定 > repo・出力先 > 環境変数の順に参照）
+        静的ファイルはプロファイル同士で上書きしないよう、出力先をプロファイルごとに分ける
+        """
+        overrides = {
+            "STATIC_OUTPUT_DIR": self.static_dir or os.path.join(environ.get("STATIC_OUTPUT_DIR", "public"), self.name)
+        }
+        if self.repo:
+            overrides["GITHUB_REPOSITORY"] = self.repo
+        return ChainMap(self.settings, overrides, environ)
+
+    # 設定ファイルのキーと期待する型
+    FIELD_TYPES = {
+        "name": str,
+        "criteria": list,
+        "top_n": int,
+        "sources": list,
+        "repo": str,
+        "notifiers": list,
+        "settings": dict,
+    }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Profile":
+        if not isinstance(data, dict):
+            raise ValueError(f"Profile must be an object, got {type(data).__name__}")
+        unknown = set(data) - set(cls.FIELD_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown keys in profile {data.get('name')!r}: {', '.join(sorted(unknown))}")
+        if "name" not in data:
+            raise ValueError("Profile without name")
+
+        for key, value in data.items():
+            expected = cls.FIELD_TYPES[key]
+            # boolはintのサブクラスのため、top_n: true などは別に弾く
+            if not isinstance(value, expected) or isinstance(value, bool):
+                raise ValueError(f"{key!r} in profile {data.get('name')!r} must be {expected.__name__}, "
+                                 f"got {type(value).__name__}")
+            if expected is list and not all(isinstance(v, str) for v in value):
+                raise ValueError(f"{key!r} in profile {data.get('name')!r} must be a list of strings")
+            if expected is dict and not all(isinstance(v, str) for v in value.values()):
+                raise ValueError(f"{key!r} in profile {data.get('name')!r} must map names to strings")
+
+        return cls(
+            name=data["name"],
+            criteria=data.get("criteria"),
+            top_n=data.get("top_n", 5),
+            sources=data.get("sources"),
+            repo=data.get("repo"),
+            notifiers=data.get("notifiers"),
+            settings=data.get("settings")
+        )
+
+
+def load_profiles(profiles_file: str) -> List[Profile]:
+    """プロファイル設定ファイル（JSON）を読み込む"""
+    with open(profiles_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)  # JSONの構文エラー（JSONDecodeError）はValueErrorのサブクラス
+
+    if not isinstance(data, dict):
+        raise ValueError(f'Top level must be an object like {{"profiles": [...]}}, got {type(data).__name__}')
+    if not isinstance(data.get("profiles", []), list):
+        raise ValueError('"profiles" must be a list')
+
+    profiles = [Profile.from_dict(p) for p in data.get("profiles", [])]
+    if not profiles:
+        raise ValueError(f"No profiles defined in {profiles_file}")
+
+    names = [p.name for p in profiles]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate profile names: {', '.join(sorted(duplicates))}")
+
+    return profiles
@@ -0,0 +1,228 @@
+"""
+実行スナップショット
+各ステージの入出力（取得したニュース・履歴・AIへのプロンプトと応答・要約）を
+gzip圧縮したJSONに保存し、後からネットワークやAPIを使わずに再実行できるようにする
+
+使い方:
+    python main.py --snapshot                       # 実行してスナップショットを保存
+    python main.py --replay data/snapshots/20251107-090000.json.gz --stage rank
+"""
+import cProfile
+import gzip
+import hashlib
+import io
+import json
+import os
+import pstats
+import tempfile
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List, Dict, Optional
+from .ai_analyzer import AIAnalyzer
+from .fetchers.base import NewsItem
+from .history_manager import HistoryManager
+from .notifiers import Digest
+from .summary_cache import SummaryCache
+
+
+def news_to_dict(item: NewsItem) -> Dict:
+    """NewsItemを抽出済み本文も含めて辞書にする"""
+    return dict(item.to_dict(), content=item.content)
+
+
+def analysis_to_dict(news_with_analysis: List[Dict]) -> List[Dict]:
+    return [{
+        "news": news_to_dict(item['news']),
+        "summary": item.get('summary'),
+        "comment": item.get('comment'),
+    } for item in news_with_analysis]
+
+
+def analysis_from_dict(data: List[Dict]) -> List[Dict]:
+    return [dict(item, news=NewsItem.from_dict(item['news'])) for item in data]
+
+
+class RunSnapshot:
+    """1回の実行の各ステージの入出力"""
+
+    def __init__(self, run_id: Optional[str] = None):
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.stages: Dict[str, Dict] = {}
+        self.llm_calls: List[Dict] = []
+        self.current_stage: Optional[str] = None
+
+    def record(self, stage: str, **data):
+        """ステージの入出力を記録（同じステージへの記録はマージする）"""
+        self.stages.setdefault(stage, {}).update(data)
+
+    def save(self, snapshot_dir: str = "data/snapshots", keep: int = 48) -> str:
+        """gzip圧縮して保存し、古いスナップショットを削除"""
+        os.makedirs(snapshot_dir, exist_ok=True)
+        path = os.path.join(snapshot_dir, f"{self.run_id}.json.gz")
+        data = {
+            "run_id": self.run_id,
+            "stages": self.stages,
+            "llm_calls": self.llm_calls,
+        }
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+        snapshots = sorted(name for name in os.listdir(snapshot_dir) if name.endswith(".json.gz"))
+        for name in snapshots[:-keep]:
+            os.remove(os.path.join(snapshot_dir, name))
+
+        print(f"Saved run snapshot: {path}")
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "RunSnapshot":
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        snapshot = cls(data["run_id"])
+        snapshot.stages = data["stages"]
+        snapshot.llm_calls = data["llm_calls"]
+        return snapshot
+
+
+def _prompt_key(kwargs: Dict) -> str:
+    """プロンプトから応答を引くためのキー"""
+    payload = json.dumps(kwargs.get("messages"), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RecordingClient:
+    """Anthropicクライアントをラップし、messages.createの入出力をスナップショットに記録"""
+
+    def __init__(self, client, snapshot: RunSnapshot):
+        self._client = client
+        self._snapshot = snapshot
+        self.messages = SimpleNamespace(create=self._create)
+
+    def _create(self, **kwargs):
+        message = self._client.messages.create(**kwargs)
+        self._snapshot.llm_calls.append({
+            "stage": self._snapshot.current_stage,
+            "key": _prompt_key(kwargs),
+            "prompt": kwargs.get("messages"),
+            "max_tokens": kwargs.get("max_tokens"),
+            "response": message.content[0].text,
+        })
+        return message
+
+
+class ReplayClient:
+    """記録したAIの応答を返すクライアント（APIを呼ばない）"""
+
+    def __init__(self, llm_calls: List[Dict]):
+        self._responses = {call["key"]: call["response"] for call in llm_calls}
+        self.misses = 0
+        self.messages = SimpleNamespace(create=self._create)
+
+    def _create(self, **kwargs):
+        response = self._responses.get(_prompt_key(kwargs))
+        if response is None:
+            # プロンプトが変わった場合はAPIエラーと同じ扱い（各ステージのフォールバックが動く）
+            self.misses += 1
+            raise LookupError("prompt not found in snapshot")
+        return SimpleNamespace(content=[SimpleNamespace(text=response)])
+
+
+REPLAYABLE_STAGES = ["filter", "rank", "summarize", "render"]
+
+
+def replay(path: str, stage: str, profile_out: Optional[str] = None, limit: int = 30):
+    """
+    スナップショットからステージをオフラインで再実行し、プロファイル結果を表示
+    stage: "filter", "rank", "summarize", "render" のいずれか（"all"で全て）
+    """
+    snapshot = RunSnapshot.load(path)
+    stages = REPLAYABLE_STAGES if stage == "all" else [stage]
+    client = ReplayClient(snapshot.llm_calls)
+    analyzer = AIAnalyzer(api_key="", client=client)
+
+    def profiles(stage_name: str) -> Dict[str, Dict]:
+        """ステージのプロファイルごとの記録（単一プロファイル時代のスナップショットも読めるようにする）"""
+        data = snapshot.stages[stage_name]
+        return data["profiles"] if "profiles" in data else {"default": data}
+
+    def run_filter():
+        actual, expected = {}, {}
+        news = [NewsItem.from_dict(d) for d in snapshot.stages["fetch"]["news"]]
+        for name, data in profiles("filter").items():
+            sources = data.get("sources")
+            candidates = [item for item in news if not sources or item.source in sources]
+            with tempfile.TemporaryDirectory() as tmp:
+                history = HistoryManager(os.path.join(tmp, "history.json"))
+                history.history = {"notified_urls": data["notified_urls"]}
+                result = history.filter_new_news(candidates)
+            actual[name] = [item.url for item in result]
+            expected[name] = data["new_urls"]
+        return actual, expected
+
+    def run_rank():
+        actual, expected = {}, {}
+        for name, data in profiles("rank").items():
+            candidates = [NewsItem.from_dict(d) for d in data["candidates"]]
+            result = analyzer.rank_news(candidates, top_n=data["top_n"], criteria=data.get("criteria"))
+            actual[name] = [item.url for item in result]
+            expected[name] = data["selected_urls"]
+        return actual, expected
+
+    def run_summarize():
+        data = snapshot.stages["summarize"]
+        outputs = {item["news"]["url"]: item for item in data["outputs"]}
+        # 記録時にキャッシュから返した要約はAIの応答が記録されていないため、同じ内容をキャッシュに入れておく
+        analyzer.summary_cache = SummaryCache(cache_file=None)
+        for d in data["inputs"]:
+            if d["url"] in data.get("cached_urls", []):
+                analyzer.summary_cache.cache[SummaryCache.make_key(NewsItem.from_dict(d), analyzer.model)] = outputs[d["url"]]
+
+        results = []
+        for d in data["inputs"]:
+            analysis = analyzer.summarize_and_comment(NewsItem.from_dict(d))
+            results.append({"summary": analysis["summary"], "comment": analysis["comment"]})
+        expected = [{"summary": outputs[d["url"]]["summary"], "comment": outputs[d["url"]]["comment"]}
+                    for d in data["inputs"]]
+        return results, expected
+
+    def run_render():
+        actual, expected = {}, {}
+        for name, data in profiles("render").items():
+            digest = Digest(analysis_from_dict(data["news_with_analysis"]),
+                            generated_at=datetime.fromisoformat(data["generated_at"]))
+            actual[name] = digest.markdown
+            expected[name] = data["markdown"]
+        return actual, expected
+
+    runners = {"filter": run_filter, "rank": run_rank, "summarize": run_summarize, "render": run_render}
+
+    print(f"Replaying snapshot {snapshot.run_id} ({path})")
+    profiler = cProfile.Profile()
+    replayed = 0
+    for name in stages:
+        if name not in snapshot.stages:
+            print(f"\n[{name}] not recorded in this snapshot, skipped")
+            continue
+
+        print(f"\n[{name}] replaying...")
+        profiler.enable()
+        actual, expected = runners[name]()
+        profiler.disable()
+        replayed += 1
+        status = "matches the recorded output" if actual == expected else "DIFFERS from the recorded output"
+        print(f"[{name}] result {status}")
+
+    if client.misses:
+        print(f"\n{client.misses} AI call(s) were not found in the snapshot (prompt changed?)")
+
+    if not replayed:
+        return
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream).sort_stats("cumulative")
+    stats.print_stats(limit)
+    print("\n" + stream.getvalue())
+
+    if profile_out:
+        profiler.dump_stats(profile_out)
+        print(f"Profile written to {profile_out} (view with: python -m pstats {profile_out})")
@@ -0,0 +1,168 @@
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+
+class SourceHealthTracker:
+    """
+    ニュースソースごとの稼働状況を記録し、取得するかどうかを判断するクラス
+
+    - サーキットブレーカー: 連続して失敗したソースは一定時間取得しない（失敗が続くほど長くする）
+    - 適応的な取得間隔: 新着のない実行が続いたソースは取得間隔を延ばす
+    """
+
+    EWMA_ALPHA = 0.3           # 指数移動平均の重み（新しい値の比率）
+    FAILURE_THRESHOLD = 3      # この回数連続で失敗したらサーキットを開く
+    BASE_COOLDOWN = 3600       # サーキットを開いている時間（秒、失敗が続くごとに2倍）
+    MAX_COOLDOWN = 24 * 3600
+    IDLE_POLLS = 3             # この回数連続で新着がなければ取得間隔を延ばす
+    BASE_INTERVAL = 2 * 3600   # 延ばすときの最初の取得間隔（秒、毎時実行の1回おき）
+    MAX_INTERVAL = 6 * 3600
+    GRACE = 300                # cronの実行時刻のずれを吸収する猶予（秒）
+    MAX_SEEN_URLS = 500        # 新着判定のためにソースごとに記録するURL数
+
+    def __init__(self, health_file: str = "data/source_health.json"):
+        self.health_file = health_file
+        self.health = self._load_health()
+
+    def should_poll(self, source: str, now: Optional[datetime] = None) -> Tuple[bool, str]:
+        """
+        このソースを今回取得すべきか
+        戻り値: (取得するかどうか, 取得しない場合の理由)
+        """
+        now = now or datetime.now()
+        state = self.health.get(source)
+        if not state:
+            return True, ""
+
+        open_until = state.get("circuit_open_until")
+        if open_until and now < datetime.fromisoformat(open_until):
+            return False, f"circuit open until {open_until[:16]} ({state['consecutive_failures']} consecutive failures)"
+
+        interval = state.get("poll_interval", 0)
+        last_polled = state.get("last_polled_at")
+        if interval and last_polled:
+            next_poll = datetime.fromisoformat(last_polled) + timedelta(seconds=interval - self.GRACE)
+            if now < next_poll:
+                return False, f"no new items recently, next poll after {next_poll.strftime('%Y-%m-%d %H:%M')}"
+
+        return True, ""
+
+    def record_success(self, source: str, latency: float, urls: List[str],
+                       now: Optional[datetime] = None) -> int:
+        """
+        取得成功を記録
+        urls: 取得した記事のURL（このソースでこれまでに見ていないURLを新着として数える）
+        戻り値: 新着件数
+
+        通知履歴は選定された記事しか記録しないため新着の判定には使わない
+        （選ばれない記事を出し続けるフィードが毎回「新着あり」になってしまう）
+        """
+        now = now or datetime.now()
+        state = self._state(source)
+        seen = state.setdefault("seen_urls", [])
+        seen_set = set(seen)
+        new_urls = [url for url in dict.fromkeys(urls) if url not in seen_set]
+        # 最近見たURLだけを残す（フィードに載っている記事数より十分大きければよい）
+        state["seen_urls"] = (seen + new_urls)[-self.MAX_SEEN_URLS:]
+
+        items = len(urls)
+        new_items = len(new_urls)
+        state["polls"] += 1
+        state["last_polled_at"] = now.isoformat()
+        state["latency_ewma"] = self._ewma(state["latency_ewma"], latency)
+        state["error_rate"] = self._ewma(state["error_rate"], 0.0)
+        state["items_per_poll"] = self._ewma(state["items_per_poll"], items)
+        state["new_items_per_poll"] = self._ewma(state["new_items_per_poll"], new_items)
+        state["consecutive_failures"] = 0
+        state["circuit_open_until"] = None
+        state["last_error"] = None
+
+        if new_items > 0:
+            state["last_new_item_at"] = now.isoformat()
+            state["idle_polls"] = 0
+            state["poll_interval"] = 0
+        else:
+            state["idle_polls"] += 1
+            if state["idle_polls"] >= self.IDLE_POLLS:
+                state["poll_interval"] = min(self.MAX_INTERVAL,
+                                             max(self.BASE_INTERVAL, state["poll_interval"] * 2))
+
+        return new_items
+
+    def record_failure(self, source: str, latency: float, error: Exception,
+                       now: Optional[datetime] = None):
+        """取得失敗を記録し、失敗が続いていればサーキットを開く"""
+        now = now or datetime.now()
+        state = self._state(source)
+        state["polls"] += 1
+        state["last_polled_at"] = now.isoformat()
+        state["latency_ewma"] = self._ewma(state["latency_ewma"], latency)
+        state["error_rate"] = self._ewma(state["error_rate"], 1.0)
+        state["consecutive_failures"] += 1
+        state["last_error"] = str(error)[:200]
+
+        failures = state["consecutive_failures"]
+        if failures >= self.FAILURE_THRESHOLD:
+            cooldown = min(self.MAX_COOLDOWN, self.BASE_COOLDOWN * 2 ** (failures - self.FAILURE_THRESHOLD))
+            state["circuit_open_until"] = (now + timedelta(seconds=cooldown)).isoformat()
+            print(f"  Circuit opened for {source} ({failures} consecutive failures, retry in {cooldown // 60} min)")
+
+    def save(self):
+        """状態をファイルに保存"""
+        try:
+            os.makedirs(os.path.dirname(self.health_file), exist_ok=True)
+            with open(self.health_file, 'w', encoding='utf-8') as f:
+                json.dump(self.health, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"Error saving source health: {e}")
+
+    def print_summary(self):
+        """各ソースの状態を表示"""
+        def fmt(value, spec):
+            # 失敗しか記録されていないソースは件数が未計測
+            return "-" if value is None else format(value, spec)
+
+        for source, state in self.health.items():
+            status = "open" if state.get("circuit_open_until") else "closed"
+            print(f"  - {source}: latency {fmt(state['latency_ewma'], '.1f')}s, "
+                  f"errors {fmt(state['error_rate'], '.0%')}, "
+                  f"items {fmt(state['items_per_poll'], '.1f')}/poll "
+                  f"(new {fmt(state['new_items_per_poll'], '.1f')}), "
+                  f"interval {state['poll_interval'] // 60}min, circuit {status}")
+
+    def _state(self, source: str) -> Dict:
+        """ソースの状態を取得（なければ初期化）"""
+        if source not in self.health:
+            self.health[source] = {
+                "polls": 0,
+                "latency_ewma": None,
+                "error_rate": None,
+                "items_per_poll": None,
+                "new_items_per_poll": None,
+                "last_new_item_at": None,
+                "last_polled_at": None,
+                "last_error": None,
+                "consecutive_failures": 0,
+                "circuit_open_until": None,
+                "idle_polls": 0,
+                "poll_interval": 0,
+                "seen_urls": [],
+            }
+        return self.health[source]
+
+    def _ewma(self, current: Optional[float], value: float) -> float:
+        if current is None:
+            return float(value)
+        return self.EWMA_ALPHA * value + (1 - self.EWMA_ALPHA) * current
+
+    def _load_health(self) -> Dict[str, Dict]:
+        """状態ファイルを読み込み"""
+        if os.path.exists(self.health_file):
+            try:
+                with open(self.health_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Error loading source health: {e}")
+        return {}
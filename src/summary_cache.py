@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from .fetchers.base import NewsItem
+
+
+class SummaryCache:
+    """AIが生成した要約・コメントを記録し、同じ記事を再度要約しないようにするクラス"""
+
+    def __init__(self, cache_file: Optional[str] = "data/summary_cache.json"):
+        """
+        Args:
+            cache_file: キャッシュファイル（Noneの場合はメモリ上のみ）
+        """
+        self.cache_file = cache_file
+        self.cache = self._load_cache()
+
+    @staticmethod
+    def make_key(news_item: NewsItem, model: str) -> str:
+        """URL・要約に使う本文・モデルからキーを生成（本文が変われば別のキーになる）"""
+        text = news_item.content or news_item.description[:500]
+        digest = hashlib.sha256(f"{model}\0{news_item.url}\0{text}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        entry = self.cache.get(key)
+        if not entry:
+            return None
+        return {"summary": entry["summary"], "comment": entry["comment"]}
+
+    def put(self, key: str, analysis: Dict[str, str]):
+        self.cache[key] = {
+            "summary": analysis["summary"],
+            "comment": analysis["comment"],
+            "created_at": datetime.now().isoformat(),
+        }
+        self._save_cache()
+
+    def cleanup_old_entries(self, days: int = 30):
+        """指定日数より古いエントリを削除"""
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        keys_to_remove = [key for key, entry in self.cache.items() if entry.get("created_at", "") < cutoff]
+        for key in keys_to_remove:
+            del self.cache[key]
+
+        if keys_to_remove:
+            self._save_cache()
+            print(f"Cleaned up {len(keys_to_remove)} old summary cache entries")
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Error loading summary cache: {e}")
+        return {}
+
+    def _save_cache(self):
+        if not self.cache_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"Error saving summary cache: {e}")
@@ -0,0 +1,240 @@
+"""
+通知先のテスト（GitHub API・Webhookの代わりにローカルのHTTPサーバーを使う）
+
+実行方法:
+    python -m unittest discover tests
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.fetchers.base import NewsItem
+from src.notifiers import Digest, GitHubNotifier, StaticFileNotifier, WebhookNotifier, deliver_all
+
+
+class StubServer:
+    """
+    GitHub Issues APIとWebhookを模したHTTPサーバー
+    responses: パスごとに次のPOSTで返す (ステータス, 受理するかどうか, 待機秒数) のリスト
+    get_errors: 次のGETで返すエラーステータスのリスト
+    """
+
+    def __init__(self):
+        self.issues = []
+        self.posts = []
+        self.responses = {}
+        self.get_errors = []
+        self.gets = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                # 送信済み確認・当日Issueの検索用のIssue一覧
+                stub.gets += 1
+                if stub.get_errors:
+                    self._reply(stub.get_errors.pop(0), {"message": "error"})
+                    return
+                self._reply(200, stub.issues)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                stub.posts.append((self.path, body))
+                queued = stub.responses.get(self.path)
+                status, accept, delay = queued.pop(0) if queued else (201, True, 0)
+                if delay:
+                    time.sleep(delay)
+                result = {"ok": True}
+                if accept and self.path.endswith("/issues"):
+                    number = len(stub.issues) + 1
+                    result = dict(body, number=number, html_url=f"http://stub/issues/{number}")
+                    stub.issues.append(result)
+                self._reply(status, result)
+
+            def _reply(self, status, payload):
+                data = json.dumps(payload).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # クライアントがタイムアウトして切断済み
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def posts_to(self, suffix):
+        return [body for path, body in self.posts if path.endswith(suffix)]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_digest(title="生成AIの新しいモデルが公開", generated_at=None):
+    news = NewsItem(title, f"https://example.com/{abs(hash(title))}", datetime(2025, 11, 7, 9), "ITmedia", "説明")
+    return Digest([{"news": news, "summary": "要約", "comment": "コメント"}], generated_at=generated_at)
+
+
+class NotifierTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.stub = StubServer()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.stub.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def github(self, **kwargs):
+        kwargs.setdefault("max_retries", 0)
+        return GitHubNotifier(
+            "token", "owner", "repo",
+            cache_file=os.path.join(self.tmp_dir, "issue_cache.json"),
+            outbox_dir=os.path.join(self.tmp_dir, "outbox"),
+            api_base=self.stub.url,
+            **kwargs
+        )
+
+    def webhook(self, **kwargs):
+        return WebhookNotifier(f"{self.stub.url}/hook", **kwargs)
+
+    def outbox_files(self, *subdir):
+        path = os.path.join(self.tmp_dir, "outbox", *subdir)
+        if not os.path.isdir(path):
+            return []
+        return [name for name in os.listdir(path) if name.endswith(".json")]
+
+
+class DeliverAllTest(NotifierTestCase):
+
+    def test_fans_out_to_all_notifiers(self):
+        static = StaticFileNotifier(output_dir=os.path.join(self.tmp_dir, "public"))
+        results = deliver_all(make_digest(), [self.github(), self.webhook(), static])
+
+        self.assertEqual(results, {"GitHub (owner/repo)": True, "Slack": True,
+                                   f"Static files ({static.output_dir})": True})
+        self.assertEqual(len(self.stub.posts_to("/issues")), 1)
+        self.assertEqual(len(self.stub.posts_to("/hook")), 1)
+        self.assertTrue(os.path.exists(os.path.join(static.output_dir, "latest.md")))
+
+    def test_failure_is_isolated(self):
+        self.stub.responses["/hook"] = [(400, False, 0)]
+        results = deliver_all(make_digest(), [self.webhook(), self.github()])
+
+        self.assertEqual(results, {"Slack": False, "GitHub (owner/repo)": True})
+        self.assertEqual(len(self.stub.issues), 1)
+
+    def test_timeout_stops_the_notifier(self):
+        self.stub.responses["/hook"] = [(200, True, 3)]
+        webhook = self.webhook()
+        webhook.timeout = 0.5
+
+        started = time.monotonic()
+        results = deliver_all(make_digest(), [webhook, self.github()])
+        self.assertEqual(results, {"Slack": False, "GitHub (owner/repo)": True})
+        self.assertLess(time.monotonic() - started, 1.5)
+
+        # 期限を過ぎた通知先のスレッドも期限の直後に終わる（実行全体を延ばさない）
+        for thread in threading.enumerate():
+            if thread.name.startswith("notifier"):
+                thread.join(timeout=2)
+                self.assertFalse(thread.is_alive())
+        self.assertLess(time.monotonic() - started, 1.5)
+
+
+class WebhookTest(NotifierTestCase):
+
+    def test_server_error_is_not_reposted(self):
+        # 5xxでも受理済みの可能性があるため、再送すると二重投稿になる
+        self.stub.responses["/hook"] = [(500, True, 0)]
+        results = deliver_all(make_digest(), [self.webhook()])
+
+        self.assertEqual(results, {"Slack": False})
+        self.assertEqual(len(self.stub.posts_to("/hook")), 1)
+
+    def test_rate_limit_is_retried(self):
+        self.stub.responses["/hook"] = [(429, False, 0)]
+        # Retry-Afterがないため2秒のバックオフを待ってから再送する
+        results = deliver_all(make_digest(), [self.webhook()])
+
+        self.assertEqual(results, {"Slack": True})
+        self.assertEqual(len(self.stub.posts_to("/hook")), 2)
+
+
+class GitHubOutboxTest(NotifierTestCase):
+
+    def test_replay_does_not_post_twice(self):
+        # Issueは作成されたがレスポンスがエラーだった場合（送信済みかどうか分からない）
+        self.stub.responses["/repos/owner/repo/issues"] = [(502, True, 0)]
+        github = self.github()
+
+        self.assertEqual(deliver_all(make_digest(), [github]), {"GitHub (owner/repo)": False})
+        self.assertEqual(len(self.outbox_files()), 1)
+
+        # 次回の実行: マーカーで送信済みと判定し、再投稿せずにoutboxから削除する
+        self.assertEqual(self.github().flush_outbox(), 0)
+        self.assertEqual(len(self.stub.posts_to("/issues")), 1)
+        self.assertEqual(len(self.stub.issues), 1)
+        self.assertEqual(self.outbox_files(), [])
+
+    def test_failed_delivery_is_replayed(self):
+        self.stub.responses["/repos/owner/repo/issues"] = [(503, False, 0)]
+        self.assertEqual(deliver_all(make_digest(), [self.github()]), {"GitHub (owner/repo)": False})
+        self.assertEqual(self.stub.issues, [])
+
+        self.assertEqual(self.github().flush_outbox(), 0)
+        self.assertEqual(len(self.stub.issues), 1)
+        self.assertEqual(self.outbox_files(), [])
+
+    def test_unauthorized_is_kept_for_next_run(self):
+        # トークンの期限切れなど。直せば次回に送信できるため failed/ には移動しない
+        self.stub.responses["/repos/owner/repo/issues"] = [(401, False, 0)]
+        self.assertEqual(deliver_all(make_digest(), [self.github()]), {"GitHub (owner/repo)": False})
+        self.assertEqual(len(self.outbox_files()), 1)
+        self.assertEqual(self.outbox_files("failed"), [])
+
+        self.assertEqual(self.github().flush_outbox(), 0)
+        self.assertEqual(len(self.stub.issues), 1)
+        self.assertEqual(self.outbox_files(), [])
+
+    def test_append_lookup_error_does_not_create_another_issue(self):
+        # 当日のIssueの検索に失敗した場合は新規作成せず、outboxに残す
+        self.stub.get_errors = [500]
+        github = self.github(mode=GitHubNotifier.MODE_APPEND)
+        self.assertEqual(deliver_all(make_digest(), [github]), {"GitHub (owner/repo)": False})
+        self.assertEqual(self.stub.posts, [])
+        self.assertEqual(len(self.outbox_files()), 1)
+
+        self.assertEqual(self.github(mode=GitHubNotifier.MODE_APPEND).flush_outbox(), 0)
+        self.assertEqual(len(self.stub.issues), 1)
+        self.assertEqual(self.outbox_files(), [])
+
+    def test_permanent_failure_does_not_block_newer_digests(self):
+        self.stub.responses["/repos/owner/repo/issues"] = [(422, False, 0)]
+        github = self.github()
+        github._enqueue_digest(make_digest("古いダイジェスト", generated_at=datetime(2025, 11, 7, 9)))
+        github._enqueue_digest(make_digest("新しいダイジェスト", generated_at=datetime(2025, 11, 7, 10)))
+
+        self.assertEqual(github.flush_outbox(), 0)
+        self.assertEqual(len(self.stub.issues), 1)
+        self.assertIn("新しいダイジェスト", self.stub.issues[0]["body"])
+        self.assertEqual(self.outbox_files(), [])
+        self.assertEqual(len(self.outbox_files("failed")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
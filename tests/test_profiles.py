@@ -0,0 +1,70 @@
+"""
+プロファイル設定ファイルの読み込みのテスト
+
+実行方法:
+    python -m unittest discover tests
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.profiles import load_profiles
+
+
+class LoadProfilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "profiles.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def load(self, data):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        return load_profiles(self.path)
+
+    def test_loads_profiles(self):
+        profiles = self.load({"profiles": [
+            {"name": "backend", "top_n": 3, "sources": ["ITmedia"], "repo": "org/backend"},
+            {"name": "frontend", "notifiers": ["static"], "settings": {"STATIC_SITE_URL": "https://example.com"}},
+        ]})
+
+        self.assertEqual([p.name for p in profiles], ["backend", "frontend"])
+        self.assertEqual(profiles[0].top_n, 3)
+        self.assertTrue(profiles[0].accepts("ITmedia"))
+        self.assertFalse(profiles[0].accepts("Hacker News"))
+        self.assertEqual(profiles[0].history_file, os.path.join("data", "profiles", "backend", "history.json"))
+        self.assertEqual(profiles[1].notifier_settings({})["STATIC_OUTPUT_DIR"], os.path.join("public", "frontend"))
+
+    def test_rejects_malformed_files(self):
+        cases = [
+            [{"name": "backend"}],                                  # トップレベルが配列
+            {"profiles": {"backend": {}}},                          # profilesがオブジェクト
+            {"profiles": ["backend"]},                              # プロファイルが文字列
+            {"profiles": [{"name": "backend", "top_n": "3"}]},      # top_nが文字列
+            {"profiles": [{"name": "backend", "top_n": True}]},
+            {"profiles": [{"name": "backend", "criteria": "AI"}]},  # criteriaが配列でない
+            {"profiles": [{"name": "backend", "sources": [1]}]},
+            {"profiles": [{"name": "backend", "settings": {"WEBHOOK_URL": None}}]},
+            {"profiles": [{"name": "backend", "unknown": 1}]},
+            {"profiles": [{"name": "backend"}, {"name": "backend"}]},
+            {"profiles": []},
+        ]
+        for data in cases:
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    self.load(data)
+
+    def test_rejects_invalid_json(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("{profiles: ")
+        with self.assertRaises(ValueError):
+            load_profiles(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+ソースの稼働状況（サーキットブレーカー・適応的な取得間隔）のテスト
+
+実行方法:
+    python -m unittest discover tests
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from src.source_health import SourceHealthTracker
+
+START = datetime(2025, 11, 7, 9, 0)
+HOUR = timedelta(hours=1)
+
+
+class SourceHealthTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.health_file = os.path.join(self.tmp_dir, "source_health.json")
+        self.tracker = SourceHealthTracker(self.health_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def state(self, source="ITmedia"):
+        return self.tracker.health[source]
+
+
+class CircuitBreakerTest(SourceHealthTestCase):
+
+    def fail(self, now):
+        self.tracker.record_failure("ITmedia", 10.0, TimeoutError("timed out"), now=now)
+
+    def test_opens_after_consecutive_failures(self):
+        self.fail(START)
+        self.fail(START + HOUR)
+        self.assertTrue(self.tracker.should_poll("ITmedia", START + 2 * HOUR)[0])
+
+        self.fail(START + 2 * HOUR)
+        should_poll, reason = self.tracker.should_poll("ITmedia", START + 2 * HOUR + timedelta(minutes=30))
+        self.assertFalse(should_poll)
+        self.assertIn("circuit open", reason)
+        # BASE_COOLDOWN（1時間）が過ぎたら再び取得する
+        self.assertTrue(self.tracker.should_poll("ITmedia", START + 3 * HOUR)[0])
+
+    def test_cooldown_doubles_up_to_the_maximum(self):
+        now = START
+        cooldowns = []
+        for _ in range(10):
+            self.fail(now)
+            open_until = self.state()["circuit_open_until"]
+            if open_until:
+                cooldowns.append(datetime.fromisoformat(open_until) - now)
+                now = datetime.fromisoformat(open_until)
+            else:
+                now += HOUR
+
+        hours = [int(c.total_seconds() // 3600) for c in cooldowns]
+        self.assertEqual(hours, [1, 2, 4, 8, 16, 24, 24, 24])
+
+    def test_success_closes_the_circuit(self):
+        for i in range(3):
+            self.fail(START + i * HOUR)
+        self.tracker.record_success("ITmedia", 1.0, ["https://example.com/1"], now=START + 4 * HOUR)
+
+        self.assertIsNone(self.state()["circuit_open_until"])
+        self.assertEqual(self.state()["consecutive_failures"], 0)
+        self.assertTrue(self.tracker.should_poll("ITmedia", START + 4 * HOUR)[0])
+
+
+class AdaptiveIntervalTest(SourceHealthTestCase):
+
+    URLS = [f"https://example.com/{i}" for i in range(20)]
+
+    def poll_hourly(self, urls, hours):
+        """毎時実行を模して、取得すべき時だけ取得する。戻り値: 取得した時刻のリスト"""
+        polled = []
+        for i in range(hours):
+            now = START + i * HOUR
+            if self.tracker.should_poll("ITmedia", now)[0]:
+                self.tracker.record_success("ITmedia", 1.0, urls, now=now)
+                polled.append(i)
+        return polled
+
+    def test_static_feed_backs_off(self):
+        # 同じ記事を出し続けるフィードは、3回連続で新着がなければ取得間隔を2→4→6時間と延ばす
+        polled = self.poll_hourly(self.URLS, 20)
+
+        self.assertEqual(polled, [0, 1, 2, 3, 5, 9, 15])
+        self.assertEqual(self.state()["poll_interval"], SourceHealthTracker.MAX_INTERVAL)
+
+    def test_new_items_reset_the_interval(self):
+        self.poll_hourly(self.URLS, 6)
+        self.assertGreater(self.state()["poll_interval"], 0)
+
+        now = START + 12 * HOUR
+        new_items = self.tracker.record_success("ITmedia", 1.0, self.URLS + ["https://example.com/new"], now=now)
+        self.assertEqual(new_items, 1)
+        self.assertEqual(self.state()["poll_interval"], 0)
+        self.assertEqual(self.state()["idle_polls"], 0)
+        self.assertTrue(self.tracker.should_poll("ITmedia", now + HOUR)[0])
+
+    def test_new_items_are_counted_per_source(self):
+        self.assertEqual(self.tracker.record_success("ITmedia", 1.0, self.URLS, now=START), 20)
+        # 別のソースで同じURLを見ていても、そのソースにとっては新着
+        self.assertEqual(self.tracker.record_success("Publickey", 1.0, self.URLS[:5], now=START), 5)
+        self.assertEqual(self.tracker.record_success("ITmedia", 1.0, self.URLS[:5], now=START + HOUR), 0)
+
+    def test_seen_urls_are_trimmed(self):
+        limit = SourceHealthTracker.MAX_SEEN_URLS
+        urls = [f"https://example.com/{i}" for i in range(limit + 50)]
+        self.tracker.record_success("ITmedia", 1.0, urls, now=START)
+
+        seen = self.state()["seen_urls"]
+        self.assertEqual(len(seen), limit)
+        # 古いURLから削除される
+        self.assertEqual(seen[0], urls[50])
+        self.assertEqual(seen[-1], urls[-1])
+
+    def test_state_survives_save_and_load(self):
+        self.poll_hourly(self.URLS, 6)
+        self.tracker.save()
+
+        reloaded = SourceHealthTracker(self.health_file)
+        self.assertEqual(reloaded.health, self.tracker.health)
+        self.assertEqual(reloaded.record_success("ITmedia", 1.0, self.URLS, now=START + 12 * HOUR), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()